@@ -1,7 +1,21 @@
+import asyncio
 from colorama import Fore, Style
 import config.risk_config as risk_config
 
 
+async def prompt_async(prompt):
+    """
+    Read a line from stdin without blocking the event loop
+
+    Args:
+        prompt: Prompt text shown to the user
+
+    Returns:
+        str: The line entered by the user
+    """
+    return await asyncio.to_thread(input, prompt)
+
+
 def display_menu():
     """Display the main menu options with current risk profile settings"""
     # Get current risk profile
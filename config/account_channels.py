@@ -294,14 +294,14 @@ class AccountChannelManager:
             return False
 
         monitored_channels = account_config.get('monitored_channels', [])
-        # Normalize channel entries to just IDs
-        normalized_channels = [self._normalize_channel_id(ch) for ch in monitored_channels]
+        # Normalize channel entries to a set of IDs
+        normalized_channels = {self._normalize_channel_id(ch) for ch in monitored_channels}
 
         # Generate all possible variants of the incoming channel ID
         channel_variants = self._get_channel_id_variants(channel_id)
 
         # Check if any variant matches any configured channel
-        return any(variant in normalized_channels for variant in channel_variants)
+        return not normalized_channels.isdisjoint(channel_variants)
 
     def get_accounts_for_channel(self, channel_id: int) -> List[Dict]:
         """
@@ -324,11 +324,11 @@ class AccountChannelManager:
         for account_key, config in self.config['accounts'].items():
             if config.get('enabled', False):
                 monitored_channels = config.get('monitored_channels', [])
-                # Normalize channel entries to just IDs
-                normalized_channels = [self._normalize_channel_id(ch) for ch in monitored_channels]
+                # Normalize channel entries to a set of IDs
+                normalized_channels = {self._normalize_channel_id(ch) for ch in monitored_channels}
 
                 # Check if any variant matches any configured channel
-                if any(variant in normalized_channels for variant in channel_variants):
+                if not normalized_channels.isdisjoint(channel_variants):
                     trading_accounts.append(config)
 
         return trading_accounts
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import logging
@@ -8,6 +9,12 @@ logger = logging.getLogger(__name__)
 # Global static memory cache that persists across instances
 GLOBAL_ORDER_CACHE = {}
 
+# Events for callers waiting on a message whose orders haven't been stored yet
+ORDER_STORED_EVENTS = {}
+
+# Number of callers currently waiting on each event in ORDER_STORED_EVENTS
+ORDER_WAITER_COUNTS = {}
+
 
 class OrderCache:
     """
@@ -82,8 +89,8 @@ class OrderCache:
         # Ensure message_id is a string for consistency
         str_message_id = str(message_id)
 
-        # Ensure order_ids are strings
-        str_order_ids = [str(order_id) for order_id in order_ids]
+        # Ensure order_ids are unique strings, keeping their order
+        str_order_ids = list(dict.fromkeys(str(order_id) for order_id in order_ids))
 
         # Store in global cache first
         GLOBAL_ORDER_CACHE[str_message_id] = {
@@ -94,6 +101,12 @@ class OrderCache:
             'timestamp': datetime.now().isoformat()
         }
 
+        # Wake anyone waiting for this message's orders
+        event = ORDER_STORED_EVENTS.pop(str_message_id, None)
+        ORDER_WAITER_COUNTS.pop(str_message_id, None)
+        if event:
+            event.set()
+
         # Debug logging (only in log files)
         logger.debug(
             f"Stored orders for message_id: '{str_message_id}' with {len(order_ids)} orders")
@@ -127,6 +140,42 @@ class OrderCache:
             logger.debug(f"No orders found for message ID {str_message_id}")
             return None
 
+    async def wait_for_orders(self, message_id, timeout):
+        """
+        Get orders for a message, waiting briefly if they haven't been stored yet.
+        Covers replies that arrive while the signal's orders are still being placed.
+
+        Args:
+            message_id: Telegram message ID
+            timeout: Maximum seconds to wait
+
+        Returns:
+            dict: Cached order data or None if nothing was stored in time
+        """
+        orders = self.get_orders(message_id)
+        if orders:
+            return orders
+
+        str_message_id = str(message_id)
+        event = ORDER_STORED_EVENTS.setdefault(str_message_id, asyncio.Event())
+        ORDER_WAITER_COUNTS[str_message_id] = ORDER_WAITER_COUNTS.get(str_message_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            # Drop the event once its last waiter leaves so unanswered waits don't
+            # accumulate; store_orders has already removed it if it was set
+            if ORDER_STORED_EVENTS.get(str_message_id) is event:
+                remaining = ORDER_WAITER_COUNTS[str_message_id] - 1
+                if remaining:
+                    ORDER_WAITER_COUNTS[str_message_id] = remaining
+                else:
+                    del ORDER_STORED_EVENTS[str_message_id]
+                    del ORDER_WAITER_COUNTS[str_message_id]
+
+        return self.get_orders(message_id)
+
     def remove_order(self, message_id, order_id):
         """
         Remove a specific order from a message's orders list after it's been cancelled.
@@ -176,6 +225,50 @@ class OrderCache:
             logger.info(f"Order {str_order_id} not found in message {str_message_id}")
             return False
 
+    def remove_orders(self, message_id, order_ids):
+        """
+        Remove several orders from a message's orders list in one pass and save once.
+
+        Args:
+            message_id: The message ID associated with the orders
+            order_ids: The order IDs to remove
+
+        Returns:
+            int: Number of orders removed
+        """
+        # Convert to string for consistency
+        str_message_id = str(message_id)
+        ids_to_remove = {str(order_id) for order_id in order_ids}
+
+        # Check if message exists in cache
+        message_data = GLOBAL_ORDER_CACHE.get(str_message_id)
+        if message_data is None:
+            logger.info(
+                f"Message ID {str_message_id} not found in cache when trying to "
+                f"remove {len(ids_to_remove)} orders")
+            return 0
+
+        orders_list = message_data.get('orders', [])
+        remaining_orders = [order_id for order_id in orders_list if order_id not in ids_to_remove]
+        removed_count = len(orders_list) - len(remaining_orders)
+
+        if not removed_count:
+            return 0
+
+        logger.info(f"Removed {removed_count} orders from message {str_message_id}")
+
+        # If no orders left, remove the entire message entry
+        if not remaining_orders:
+            del GLOBAL_ORDER_CACHE[str_message_id]
+            logger.info(f"Removed message {str_message_id} from cache as it has no more orders")
+        else:
+            message_data['orders'] = remaining_orders
+            logger.info(f"Message {str_message_id} now has {len(remaining_orders)} orders")
+
+        # Save changes to file
+        self.save_cache()
+        return removed_count
+
     def remove_message(self, message_id):
         """
         Remove an entire message entry from the cache after all its orders are processed
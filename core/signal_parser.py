@@ -4,10 +4,14 @@ import json
 import os
 import logging
 import asyncio
+import copy
+import hashlib
 import re
 import unicodedata
+from collections import OrderedDict
 from dotenv import load_dotenv
 from utils.instrument_utils import normalize_instrument_name
+from utils.json_utils import json_dumps, json_loads
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -15,8 +19,22 @@ logger = logging.getLogger(__name__)
 api_key = os.getenv("OPENAI_API_KEY")
 api_url = "https://api.openai.com/v1/chat/completions"
 
-# Cache for parsed signals to avoid duplicate processing
-parsed_signal_cache = {}
+# Cache for parsed signals to avoid duplicate processing, keyed by _parse_cache_key
+# and bounded to the PARSE_CACHE_SIZE most recently used messages
+PARSE_CACHE_SIZE = 1024
+parsed_signal_cache = OrderedDict()
+
+# Returned by _get_cached_parse on a miss, since None is a cached result
+_CACHE_MISS = object()
+
+# Shared session for OpenAI requests, so connections are kept alive between signals
+_session = None
+
+# Pooled connection for the synchronous parse_signal path
+_sync_session = requests.Session()
+
+# In-flight parses per message, so accounts trading the same message share one OpenAI call
+_inflight_parses = {}
 
 # Broker price difference configuration
 # This can be adjusted based on observed differences between signal provider and your broker
@@ -26,6 +44,66 @@ BROKER_PRICE_ADJUSTMENTS = {
     "XAUUSD": 0  # Add adjustments for other instruments as needed
 }
 
+# Extra take profit offset for broker spread differences, added for buys and subtracted for sells
+BROKER_DIRECTIONAL_TP_ADJUSTMENTS = {
+    "DJI30": 5
+}
+
+# Forex pair pre-filter, matched case-insensitively so the message isn't upper-cased first
+FOREX_PAIR_PATTERN = re.compile(r'\b[A-Z]{3}[A-Z]{3}\b', re.IGNORECASE)
+
+# Characters stripped before substring-matching instrument names
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^A-Z0-9]')
+
+# Whitespace runs collapsed before hashing a message for the parse cache
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _parse_cache_key(message):
+    """Hash a message with whitespace and case normalized, so reposts and edits share a cache entry"""
+    normalized = WHITESPACE_PATTERN.sub(' ', message).strip().lower()
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_parse(message):
+    """Return a cached parse result (possibly None) and mark it as recently used, or _CACHE_MISS"""
+    key = _parse_cache_key(message)
+    if key not in parsed_signal_cache:
+        return _CACHE_MISS
+    parsed_signal_cache.move_to_end(key)
+    return parsed_signal_cache[key]
+
+
+def _cache_parse(message, result):
+    """Cache a parse result, evicting the least recently used entries past PARSE_CACHE_SIZE"""
+    key = _parse_cache_key(message)
+    parsed_signal_cache[key] = result
+    parsed_signal_cache.move_to_end(key)
+    while len(parsed_signal_cache) > PARSE_CACHE_SIZE:
+        parsed_signal_cache.popitem(last=False)
+
+
+async def ensure_session():
+    """Ensure the aiohttp session used for OpenAI requests exists"""
+    global _session
+    if _session is None or _session.closed:
+        # Cache the OpenAI host's DNS and keep idle connections open between signals
+        connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60)
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            json_serialize=json_dumps
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared OpenAI session"""
+    global _session
+    if _session and not _session.closed:
+        await _session.close()
+    _session = None
+
 
 def is_potential_trading_signal(message: str) -> bool:
     """
@@ -68,8 +146,7 @@ def is_potential_trading_signal(message: str) -> bool:
     # Also check for forex pair patterns (e.g., USDCAD, EURJPY, GBPCAD, etc.)
     # Forex pairs are typically 6 letters: 3 letters + 3 letters (e.g., USDCAD)
     if not has_instrument:
-        forex_pattern = r'\b[A-Z]{3}[A-Z]{3}\b'
-        has_instrument = bool(re.search(forex_pattern, message.upper()))
+        has_instrument = bool(FOREX_PAIR_PATTERN.search(message))
 
     # Check for price patterns (numbers that might be price points)
     has_prices = bool(re.search(r'\d+\.\d+|\d+', ascii_message))
@@ -166,15 +243,16 @@ def adjust_broker_pricing(parsed_signal):
             parsed_signal['take_profits'] = [tp + adjustment for tp in parsed_signal['take_profits']]
             logger.info(f"Adjusted take profits: {parsed_signal['take_profits']}")
 
-    # Special adjustments for specific instruments (kept from original function)
-    if instrument == 'DJI30':
+    # Directional adjustments for specific instruments
+    direction_offset = BROKER_DIRECTIONAL_TP_ADJUSTMENTS.get(instrument)
+    if direction_offset:
         # Get order direction for potential direction-based adjustments
         # Handle order types with modifiers (e.g., 'buy limit', 'sell stop')
         is_buy = 'buy' in parsed_signal.get('order_type', '').lower()
 
-        # Apply additional 5-pip adjustment for broker spread differences
+        # Apply the additional adjustment for broker spread differences
         # This is in addition to the absolute price level adjustment above
-        direction_adjustment = 5 if is_buy else -5
+        direction_adjustment = direction_offset if is_buy else -direction_offset
 
         # Only adjust take profits for this directional adjustment
         if 'take_profits' in parsed_signal and parsed_signal['take_profits']:
@@ -191,21 +269,22 @@ def parse_signal(message: str):
     Caches results to avoid re-parsing identical messages.
     """
     # Check cache first
-    if message in parsed_signal_cache:
+    cached = _get_cached_parse(message)
+    if cached is not _CACHE_MISS:
         logger.debug("Using cached parsed signal")
-        return parsed_signal_cache[message]
+        return cached
 
     # Pre-filter to avoid unnecessary API calls
     if not is_potential_trading_signal(message):
         logger.info("Message doesn't appear to be a valid trading signal, skipping API call")
-        parsed_signal_cache[message] = None  # Cache the negative result
+        _cache_parse(message, None)  # Cache the negative result
         return None
 
     # Debug: Log the raw message being parsed
     logger.debug(f"Parsing new signal from Telegram: {message[:150]}...")
 
     try:
-        response = requests.post(
+        response = _sync_session.post(
             api_url,
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -247,16 +326,16 @@ def parse_signal(message: str):
 
 
                         Respond only with the JSON object or null, no additional text.'''}]})
-        content = response.json()["choices"][0]["message"]["content"].strip()
+        content = json_loads(response.content)["choices"][0]["message"]["content"].strip()
         logger.debug(f"Content from signal_parser.py: {content}")
 
         if content.lower() == "null":
             logger.info("Not a valid trading signal")
-            parsed_signal_cache[message] = None
+            _cache_parse(message, None)
             return None
 
         try:
-            result = json.loads(content)
+            result = json_loads(content)
 
             # Debug: Log what was parsed
             logger.debug(f"OpenAI parsed order_type as: '{result.get('order_type', 'MISSING')}'")
@@ -265,7 +344,7 @@ def parse_signal(message: str):
             required_fields = ['instrument', 'order_type', 'entry_point', 'stop_loss', 'take_profits']
             if not all(field in result for field in required_fields):
                 logger.warning(f"Parsed signal is missing required fields: {result}")
-                parsed_signal_cache[message] = None
+                _cache_parse(message, None)
                 return None
 
             # POST-PROCESSING: Fix order_type if OpenAI missed LIMIT/STOP/MARKET
@@ -309,14 +388,14 @@ def parse_signal(message: str):
                 value = result.get(field)
                 if value is None or not isinstance(value, (int, float)):
                     logger.warning(f"Field {field} is not numeric or is None: {value}")
-                    parsed_signal_cache[message] = None
+                    _cache_parse(message, None)
                     return None
 
             # Ensure take_profits contains numeric values and no None values
             take_profits = result.get('take_profits', [])
             if not take_profits or not all(isinstance(tp, (int, float)) and tp is not None for tp in take_profits):
                 logger.warning(f"take_profits contains non-numeric or None values: {take_profits}")
-                parsed_signal_cache[message] = None
+                _cache_parse(message, None)
                 return None
 
             # Ensure order_type is valid (allow buy, sell, and their modifiers)
@@ -331,7 +410,7 @@ def parse_signal(message: str):
                 'sell market']
             if result.get('order_type') not in valid_order_types:
                 logger.warning(f"Invalid order_type: {result.get('order_type')}")
-                parsed_signal_cache[message] = None
+                _cache_parse(message, None)
                 return None
 
             # Normalize instrument name
@@ -342,19 +421,23 @@ def parse_signal(message: str):
 
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing OpenAI response: {e}")
-            parsed_signal_cache[message] = None
+            _cache_parse(message, None)
             return None
 
         # Apply broker price adjustments
         result = adjust_broker_pricing(result)
 
         # Cache the result
-        parsed_signal_cache[message] = result
+        _cache_parse(message, result)
         return result
 
+    except requests.RequestException as e:
+        # Transient failure - not cached, so a repost of the same signal gets another attempt
+        logger.error(f"OpenAI request failed, signal not parsed: {e!r}")
+        return None
     except Exception as e:
+        # Only an explicit null answer or unparseable JSON is cached as "not a signal"
         logger.error(f"Error parsing signal: {e}", exc_info=True)
-        parsed_signal_cache[message] = None
         return None
 
 
@@ -377,17 +460,32 @@ def is_reduced_risk_signal(message: str) -> bool:
 async def parse_signal_async(message: str):
     """
     Parse a trading signal using OpenAI API - asynchronous version.
-    Caches results to avoid re-parsing identical messages.
+    Caches results to avoid re-parsing identical messages, and concurrent callers for the
+    same message (one per account following the channel) wait on a single request.
     """
     # Check cache first
-    if message in parsed_signal_cache:
+    result = _get_cached_parse(message)
+    if result is not _CACHE_MISS:
         logger.info("Using cached parsed signal")
-        return parsed_signal_cache[message]
+    else:
+        key = _parse_cache_key(message)
+        task = _inflight_parses.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_parse_signal_uncached(message))
+            _inflight_parses[key] = task
+            task.add_done_callback(lambda _: _inflight_parses.pop(key, None))
+        result = await asyncio.shield(task)
+
+    # Each caller gets its own copy - accounts replace fields such as take_profits per account
+    return copy.copy(result) if result else result
 
+
+async def _parse_signal_uncached(message: str):
+    """Parse a signal that isn't in the cache yet, caching the result"""
     # Pre-filter to avoid unnecessary API calls
     if not is_potential_trading_signal(message):
         logger.info("Message doesn't appear to be a valid trading signal, skipping API call")
-        parsed_signal_cache[message] = None  # Cache the negative result
+        _cache_parse(message, None)  # Cache the negative result
         return None
 
     try:
@@ -429,121 +527,126 @@ async def parse_signal_async(message: str):
 
                     Respond only with the JSON object or null, no additional text.'''}]}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload) as response:
-                response.raise_for_status()
-                json_response = await response.json()
-                content = json_response["choices"][0]["message"]["content"].strip()
+        session = await ensure_session()
+        async with session.post(api_url, headers=headers, json=payload) as response:
+            response.raise_for_status()
+            json_response = await response.json(loads=json_loads)
+            content = json_response["choices"][0]["message"]["content"].strip()
 
-                logger.debug(f"Content from signal_parser.py: {content}")
+            logger.debug(f"Content from signal_parser.py: {content}")
 
-                if content.lower() == "null":
-                    logger.info("Not a valid trading signal")
-                    parsed_signal_cache[message] = None
-                    return None
+            if content.lower() == "null":
+                logger.info("Not a valid trading signal")
+                _cache_parse(message, None)
+                return None
 
-                try:
-                    result = json.loads(content)
+            try:
+                result = json_loads(content)
 
-                    # Validate that required fields are present
-                    required_fields = ['instrument', 'order_type', 'entry_point', 'stop_loss', 'take_profits']
-                    if not all(field in result for field in required_fields):
-                        logger.warning(f"Parsed signal is missing required fields: {result}")
-                        parsed_signal_cache[message] = None
-                        return None
+                # Validate that required fields are present
+                required_fields = ['instrument', 'order_type', 'entry_point', 'stop_loss', 'take_profits']
+                if not all(field in result for field in required_fields):
+                    logger.warning(f"Parsed signal is missing required fields: {result}")
+                    _cache_parse(message, None)
+                    return None
 
-                    # POST-PROCESSING: Fix order_type if OpenAI missed LIMIT/STOP/MARKET
-                    order_type = result.get('order_type', '').lower()
-                    message_upper = message.upper()
-
-                    # Check if the original message contains order type modifiers that OpenAI missed
-                    if 'limit' not in order_type and 'LIMIT' in message_upper:
-                        if 'buy' in order_type:
-                            result['order_type'] = 'buy limit'
-                            logger.debug("Corrected order_type to 'buy limit' (OpenAI missed it)")
-                        elif 'sell' in order_type:
-                            result['order_type'] = 'sell limit'
-                            logger.debug("Corrected order_type to 'sell limit' (OpenAI missed it)")
-
-                    elif 'stop' not in order_type and 'STOP' in message_upper:
-                        if 'buy' in order_type:
-                            result['order_type'] = 'buy stop'
-                            logger.debug("Corrected order_type to 'buy stop' (OpenAI missed it)")
-                        elif 'sell' in order_type:
-                            result['order_type'] = 'sell stop'
-                            logger.debug("Corrected order_type to 'sell stop' (OpenAI missed it)")
-
-                    elif 'market' not in order_type and 'MARKET' in message_upper:
-                        if 'buy' in order_type:
-                            result['order_type'] = 'buy market'
-                            logger.debug("Corrected order_type to 'buy market' (OpenAI missed it)")
-                        elif 'sell' in order_type:
-                            result['order_type'] = 'sell market'
-                            logger.debug("Corrected order_type to 'sell market' (OpenAI missed it)")
-
-                    logger.debug(f"Final order_type after post-processing: '{result['order_type']}'")
-
-                    # Ensure take_profits is a list
-                    if not isinstance(result.get('take_profits', []), list):
-                        logger.warning("take_profits is not a list, converting to list")
-                        result['take_profits'] = [result['take_profits']]
-
-                    # Ensure numeric values are actually numbers and not None
-                    for field in ['entry_point', 'stop_loss']:
-                        value = result.get(field)
-                        if value is None or not isinstance(value, (int, float)):
-                            logger.warning(f"Field {field} is not numeric or is None: {value}")
-                            parsed_signal_cache[message] = None
-                            return None
-
-                    # Ensure take_profits contains numeric values and no None values
-                    take_profits = result.get('take_profits', [])
-                    if not take_profits or not all(isinstance(tp, (int, float)) and tp is not None for tp in take_profits):
-                        logger.warning(f"take_profits contains non-numeric or None values: {take_profits}")
-                        parsed_signal_cache[message] = None
+                # POST-PROCESSING: Fix order_type if OpenAI missed LIMIT/STOP/MARKET
+                order_type = result.get('order_type', '').lower()
+                message_upper = message.upper()
+
+                # Check if the original message contains order type modifiers that OpenAI missed
+                if 'limit' not in order_type and 'LIMIT' in message_upper:
+                    if 'buy' in order_type:
+                        result['order_type'] = 'buy limit'
+                        logger.debug("Corrected order_type to 'buy limit' (OpenAI missed it)")
+                    elif 'sell' in order_type:
+                        result['order_type'] = 'sell limit'
+                        logger.debug("Corrected order_type to 'sell limit' (OpenAI missed it)")
+
+                elif 'stop' not in order_type and 'STOP' in message_upper:
+                    if 'buy' in order_type:
+                        result['order_type'] = 'buy stop'
+                        logger.debug("Corrected order_type to 'buy stop' (OpenAI missed it)")
+                    elif 'sell' in order_type:
+                        result['order_type'] = 'sell stop'
+                        logger.debug("Corrected order_type to 'sell stop' (OpenAI missed it)")
+
+                elif 'market' not in order_type and 'MARKET' in message_upper:
+                    if 'buy' in order_type:
+                        result['order_type'] = 'buy market'
+                        logger.debug("Corrected order_type to 'buy market' (OpenAI missed it)")
+                    elif 'sell' in order_type:
+                        result['order_type'] = 'sell market'
+                        logger.debug("Corrected order_type to 'sell market' (OpenAI missed it)")
+
+                logger.debug(f"Final order_type after post-processing: '{result['order_type']}'")
+
+                # Ensure take_profits is a list
+                if not isinstance(result.get('take_profits', []), list):
+                    logger.warning("take_profits is not a list, converting to list")
+                    result['take_profits'] = [result['take_profits']]
+
+                # Ensure numeric values are actually numbers and not None
+                for field in ['entry_point', 'stop_loss']:
+                    value = result.get(field)
+                    if value is None or not isinstance(value, (int, float)):
+                        logger.warning(f"Field {field} is not numeric or is None: {value}")
+                        _cache_parse(message, None)
                         return None
 
-                    # Ensure order_type is valid (allow buy, sell, and their modifiers)
-                    valid_order_types = [
-                        'buy',
-                        'sell',
-                        'buy limit',
-                        'sell limit',
-                        'buy stop',
-                        'sell stop',
-                        'buy market',
-                        'sell market']
-                    if result.get('order_type') not in valid_order_types:
-                        logger.warning(f"Invalid order_type: {result.get('order_type')}")
-                        parsed_signal_cache[message] = None
-                        return None
+                # Ensure take_profits contains numeric values and no None values
+                take_profits = result.get('take_profits', [])
+                if not take_profits or not all(isinstance(tp, (int, float)) and tp is not None for tp in take_profits):
+                    logger.warning(f"take_profits contains non-numeric or None values: {take_profits}")
+                    _cache_parse(message, None)
+                    return None
 
-                    # Check if this is a reduced risk signal and add the flag
-                    result['reduced_risk'] = is_reduced_risk_signal(message)
-                    if result['reduced_risk']:
-                        logger.info(f"Signal identified as reduced risk: {message[:100]}...")
+                # Ensure order_type is valid (allow buy, sell, and their modifiers)
+                valid_order_types = [
+                    'buy',
+                    'sell',
+                    'buy limit',
+                    'sell limit',
+                    'buy stop',
+                    'sell stop',
+                    'buy market',
+                    'sell market']
+                if result.get('order_type') not in valid_order_types:
+                    logger.warning(f"Invalid order_type: {result.get('order_type')}")
+                    _cache_parse(message, None)
+                    return None
 
-                    # Normalize instrument name to canonical form
-                    if 'instrument' in result:
-                        canonical_name = normalize_instrument_name(result['instrument'])
-                        logger.debug(f"Normalized instrument name from {result['instrument']} to {canonical_name}")
-                        result['instrument'] = canonical_name
+                # Check if this is a reduced risk signal and add the flag
+                result['reduced_risk'] = is_reduced_risk_signal(message)
+                if result['reduced_risk']:
+                    logger.info(f"Signal identified as reduced risk: {message[:100]}...")
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"Error parsing OpenAI response: {e}")
-                    parsed_signal_cache[message] = None
-                    return None
+                # Normalize instrument name to canonical form
+                if 'instrument' in result:
+                    canonical_name = normalize_instrument_name(result['instrument'])
+                    logger.debug(f"Normalized instrument name from {result['instrument']} to {canonical_name}")
+                    result['instrument'] = canonical_name
 
-                # Apply broker price adjustments
-                result = adjust_broker_pricing(result)
+            except json.JSONDecodeError as e:
+                logger.error(f"Error parsing OpenAI response: {e}")
+                _cache_parse(message, None)
+                return None
+
+            # Apply broker price adjustments
+            result = adjust_broker_pricing(result)
 
-                # Cache the result
-                parsed_signal_cache[message] = result
-                return result
+            # Cache the result
+            _cache_parse(message, result)
+            return result
 
+    except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+        # Transient failure (slow response, HTTP error, dropped connection) - not cached,
+        # so a repost of the same signal gets another attempt
+        logger.error(f"OpenAI request failed, signal not parsed: {e!r}")
+        return None
     except Exception as e:
+        # Only an explicit null answer or unparseable JSON is cached as "not a signal"
         logger.error(f"Error parsing signal: {e}", exc_info=True)
-        parsed_signal_cache[message] = None
         return None
 
 
@@ -659,18 +762,20 @@ async def find_matching_instrument(instruments_client, account, parsed_signal):
     # 4. Last resort - loop through all instruments and do a manual substring check
     # This handles cases where the instrument name is completely different but might contain
     # some identifying part
+    # The canonical side is the same for every instrument, so clean it once
+    clean_canonical = NON_ALPHANUMERIC_PATTERN.sub('', canonical_name.upper())
+    canonical_parts = [part for part in clean_canonical.split() if len(part) > 2]
+
     for instrument in available_instruments:
         instr_name = instrument.get('name', '').upper()
-        base_canonical = canonical_name.upper()
 
-        # Clean up both names for comparison (remove special chars)
-        clean_instr = re.sub(r'[^A-Z0-9]', '', instr_name)
-        clean_canonical = re.sub(r'[^A-Z0-9]', '', base_canonical)
+        # Clean up the instrument name for comparison (remove special chars)
+        clean_instr = NON_ALPHANUMERIC_PATTERN.sub('', instr_name)
 
         # Check for substantial overlap
         if (clean_canonical in clean_instr or
                 clean_instr in clean_canonical or
-                any(part for part in clean_canonical.split() if len(part) > 2 and part in clean_instr)):
+                any(part in clean_instr for part in canonical_parts)):
 
             instrument_data = await instruments_client.get_instrument_by_name_async(
                 account['id'],
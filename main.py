@@ -31,6 +31,7 @@ from cli.display_menu import (
     display_risk_menu,
     display_account_risk_menu,
     get_risk_percentage_input,
+    prompt_async,
     get_drawdown_percentage_input
 )
 from services import multi_account_drawdown_manager
@@ -45,7 +46,7 @@ from tradelocker_api.endpoints.instruments import TradeLockerInstruments
 from tradelocker_api.endpoints.accounts import TradeLockerAccounts
 from tradelocker_api.endpoints.auth import TradeLockerAuth
 from core.risk_management import calculate_position_size
-from core.signal_parser import parse_signal_async
+from core.signal_parser import parse_signal_async, close_session as close_parser_session
 from cli.banner import display_banner
 from telethon import TelegramClient, events
 from dotenv import load_dotenv
@@ -56,6 +57,7 @@ import pytz
 import logging
 import asyncio
 import os
+import time
 os.system('chcp 65001 >nul')
 
 
@@ -180,9 +182,9 @@ class TradingBot:
             # Check if already authorized
             if not await self.client.is_user_authorized():
                 self.logger.info("Telegram authentication required")
-                phone = input("Please enter your phone (or bot token): ")
+                phone = await prompt_async("Please enter your phone (or bot token): ")
                 await self.client.send_code_request(phone)
-                code = input("Please enter the code you received: ")
+                code = await prompt_async("Please enter the code you received: ")
 
                 try:
                     # Simple sign-in without 2FA handling
@@ -528,7 +530,7 @@ class TradingBot:
     async def select_account(self, accounts_data):
         """Prompt user to select an account to use for trading"""
         try:
-            account_id = input("Please enter the Account Number you want to use for trading: ").strip()
+            account_id = (await prompt_async("Please enter the Account Number you want to use for trading: ")).strip()
             selected_account = next(
                 (account for account in accounts_data['accounts'] if account['accNum'] == account_id),
                 None
@@ -590,6 +592,9 @@ class TradingBot:
             if self._shutdown_flag:
                 return
 
+            # Monotonic receipt stamp for the validator's signal-age check
+            received_at = time.monotonic()
+
             # Get message text and ensure proper UTF-8 encoding
             message_text = event.message.message
 
@@ -654,7 +659,8 @@ class TradingBot:
                                 channel_id=channel_id,
                                 channel_name=channel_name,
                                 reply_to_msg_id=reply_to_msg_id,
-                                message_id=message_id
+                                message_id=message_id,
+                                received_at=received_at
                             )
                         )
                         tasks.append(task)
@@ -685,7 +691,8 @@ class TradingBot:
                         channel_id=channel_id,
                         channel_name=channel_name,
                         reply_to_msg_id=reply_to_msg_id,
-                        message_id=message_id
+                        message_id=message_id,
+                        received_at=received_at
                     )
                 )
                 self._tasks.add(task)
@@ -775,7 +782,7 @@ class TradingBot:
 
     async def process_message_for_account(self, message_text, colored_time, event, account_config,
                                           channel_id=None, channel_name=None, reply_to_msg_id=None,
-                                          message_id=None):
+                                          message_id=None, received_at=None):
         """
         Process a message for a specific account (multi-account mode)
 
@@ -788,6 +795,7 @@ class TradingBot:
             channel_name: Channel name
             reply_to_msg_id: Reply message ID
             message_id: Message ID
+            received_at: time.monotonic() value when the message arrived
         """
         try:
             # Get the account from TradeLocker
@@ -897,7 +905,15 @@ class TradingBot:
                     return
 
             # Refresh account data to get latest balance (use direct API call to avoid shared state)
-            account_state = await self.accounts_client.get_account_state_async(trading_account['id'], trading_account['accNum'])
+            # and look up the instrument at the same time - the two requests are independent
+            account_state, instrument_data = await asyncio.gather(
+                self.accounts_client.get_account_state_async(trading_account['id'], trading_account['accNum']),
+                find_matching_instrument(
+                    self.instruments_client,
+                    trading_account,
+                    parsed_signal
+                )
+            )
             if account_state and 'd' in account_state:
                 # Update the account balance with fresh data
                 trading_account['accountBalance'] = account_state['d'].get('balance', trading_account['accountBalance'])
@@ -905,13 +921,6 @@ class TradingBot:
             refreshed_account = trading_account
             float(refreshed_account['accountBalance'])
 
-            # Get instrument details
-            instrument_data = await find_matching_instrument(
-                self.instruments_client,
-                refreshed_account,
-                parsed_signal
-            )
-
             if not instrument_data:
                 self.logger.warning(
                     f"{colored_time}: {Fore.RED}[{account_name}] Instrument {parsed_signal['instrument']} not found. Skipping this signal.{Style.RESET_ALL}"
@@ -953,7 +962,8 @@ class TradingBot:
                 risk_amount,
                 max_drawdown_balance,
                 colored_time,
-                message_id=message_id
+                message_id=message_id,
+                signal_timestamp=received_at
             )
 
         except KeyError as e:
@@ -967,7 +977,7 @@ class TradingBot:
             )
 
     async def process_message(self, message_text, colored_time, event=None, channel_id=None,
-                              channel_name=None, reply_to_msg_id=None, message_id=None):
+                              channel_name=None, reply_to_msg_id=None, message_id=None, received_at=None):
         """
         Process a received Telegram message - updated to ensure message_id is passed for caching
         """
@@ -1106,7 +1116,8 @@ class TradingBot:
                 risk_amount,
                 max_drawdown_balance,
                 colored_time,
-                message_id=message_id  # Pass message_id for caching
+                message_id=message_id,  # Pass message_id for caching
+                signal_timestamp=received_at
             )
 
         except KeyError as e:
@@ -1152,7 +1163,7 @@ class TradingBot:
                 print(f"{Fore.YELLOW}1.{Style.RESET_ALL} Multi-Account Mode (route signals to configured accounts)")
                 print(f"{Fore.YELLOW}2.{Style.RESET_ALL} Single-Account Mode (select one account)")
 
-                mode_choice = input(f"\n{Fore.GREEN}Enter your choice (1-2): {Style.RESET_ALL}").strip()
+                mode_choice = (await prompt_async(f"\n{Fore.GREEN}Enter your choice (1-2): {Style.RESET_ALL}")).strip()
 
                 if mode_choice == '1':
                     # Multi-account mode
@@ -1264,6 +1275,11 @@ class TradingBot:
         if hasattr(self.quotes_client, 'close') and self.quotes_client:
             await self.quotes_client.close()
 
+        if self.signal_manager:
+            await self.signal_manager.close()
+
+        await close_parser_session()
+
         # Disconnect Telegram client
         if self.client:
             await self.client.disconnect()
@@ -1325,7 +1341,7 @@ async def handle_tp_selection(account_id=None):
 
         elif tp_choice == '7':
             # Custom selection interface
-            custom_input = input(
+            custom_input = await prompt_async(
                 f"{Fore.YELLOW}Enter TP numbers to use, separated by commas (e.g., 1,3,4): {Style.RESET_ALL}")
             try:
                 # Parse the input into a list of integers
@@ -1347,7 +1363,15 @@ async def handle_tp_selection(account_id=None):
         else:
             print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
 
-        input("\nPress Enter to continue...")
+        await prompt_async("\nPress Enter to continue...")
+
+
+# Account risk menu choices that apply a predefined profile: choice -> (profile, label, label color)
+RISK_PROFILE_CHOICES = {
+    '2': ("conservative", "Conservative", Fore.BLUE),
+    '3': ("balanced", "Balanced", Fore.GREEN),
+    '4': ("aggressive", "Aggressive", Fore.RED),
+}
 
 
 async def handle_account_specific_configuration(account_id):
@@ -1363,34 +1387,17 @@ async def handle_account_specific_configuration(account_id):
         if risk_choice == '1':
             # View current risk settings
             risk_config.display_current_risk_settings(account_id)
-            input("\nPress Enter to continue...")
-
-        elif risk_choice == '2':
-            # Apply conservative profile
-            confirmation = input(f"Apply {Fore.BLUE}Conservative{Style.RESET_ALL} risk profile? (y/n): ").lower()
-            if confirmation == 'y':
-                risk_config.apply_risk_profile("conservative", account_id)
-                print(f"{Fore.GREEN}Conservative risk profile applied.{Style.RESET_ALL}")
-                risk_config.display_current_risk_settings(account_id)
-                input("\nPress Enter to continue...")
-
-        elif risk_choice == '3':
-            # Apply balanced profile
-            confirmation = input(f"Apply {Fore.GREEN}Balanced{Style.RESET_ALL} risk profile? (y/n): ").lower()
-            if confirmation == 'y':
-                risk_config.apply_risk_profile("balanced", account_id)
-                print(f"{Fore.GREEN}Balanced risk profile applied.{Style.RESET_ALL}")
-                risk_config.display_current_risk_settings(account_id)
-                input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
-        elif risk_choice == '4':
-            # Apply aggressive profile
-            confirmation = input(f"Apply {Fore.RED}Aggressive{Style.RESET_ALL} risk profile? (y/n): ").lower()
+        elif risk_choice in RISK_PROFILE_CHOICES:
+            # Apply the conservative, balanced or aggressive profile
+            profile, label, color = RISK_PROFILE_CHOICES[risk_choice]
+            confirmation = (await prompt_async(f"Apply {color}{label}{Style.RESET_ALL} risk profile? (y/n): ")).lower()
             if confirmation == 'y':
-                risk_config.apply_risk_profile("aggressive", account_id)
-                print(f"{Fore.GREEN}Aggressive risk profile applied.{Style.RESET_ALL}")
+                risk_config.apply_risk_profile(profile, account_id)
+                print(f"{Fore.GREEN}{label} risk profile applied.{Style.RESET_ALL}")
                 risk_config.display_current_risk_settings(account_id)
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '5':
             # Configure Forex risk
@@ -1407,7 +1414,7 @@ async def handle_account_specific_configuration(account_id):
                 risk_config.update_risk_percentage("FOREX", reduced_risk, is_reduced=True, account_id=account_id)
 
             print(f"{Fore.GREEN}Forex risk settings updated.{Style.RESET_ALL}")
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '6':
             # Configure CFD risk
@@ -1424,7 +1431,7 @@ async def handle_account_specific_configuration(account_id):
                 risk_config.update_risk_percentage("CFD", reduced_risk, is_reduced=True, account_id=account_id)
 
             print(f"{Fore.GREEN}CFD risk settings updated.{Style.RESET_ALL}")
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '7':
             # Configure XAUUSD risk
@@ -1441,7 +1448,7 @@ async def handle_account_specific_configuration(account_id):
                 risk_config.update_risk_percentage("XAUUSD", reduced_risk, is_reduced=True, account_id=account_id)
 
             print(f"{Fore.GREEN}XAUUSD risk settings updated.{Style.RESET_ALL}")
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '8':
             # Configure Daily Drawdown percentage
@@ -1455,16 +1462,16 @@ async def handle_account_specific_configuration(account_id):
                 print(f"{Fore.YELLOW}Note: This creates a custom profile based on your current settings.{Style.RESET_ALL}")
                 print(f"{Fore.YELLOW}The new setting will apply after the next daily reset.{Style.RESET_ALL}")
 
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '9':
             # Reset to defaults
-            confirmation = input(
-                f"{Fore.YELLOW}Are you sure you want to reset to default (balanced) risk settings? (y/n): {Style.RESET_ALL}").lower()  # noqa: E501
+            confirmation = (await prompt_async(
+                f"{Fore.YELLOW}Are you sure you want to reset to default (balanced) risk settings? (y/n): {Style.RESET_ALL}")).lower()  # noqa: E501
             if confirmation == 'y':
                 risk_config.apply_risk_profile("balanced", account_id)
                 print(f"{Fore.GREEN}Risk settings reset to defaults (balanced profile).{Style.RESET_ALL}")
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '10':
             # Configure Take Profit Selection
@@ -1472,12 +1479,12 @@ async def handle_account_specific_configuration(account_id):
 
         elif risk_choice == '12' and account_id is not None:
             # Delete custom settings for this account
-            confirmation = input(
-                f"{Fore.YELLOW}Delete custom settings for account {account_id}? This will revert to global defaults. (y/n): {Style.RESET_ALL}").lower()  # noqa: E501
+            confirmation = (await prompt_async(
+                f"{Fore.YELLOW}Delete custom settings for account {account_id}? This will revert to global defaults. (y/n): {Style.RESET_ALL}")).lower()  # noqa: E501
             if confirmation == 'y':
                 risk_config.delete_account_settings(account_id)
                 print(f"{Fore.GREEN}Custom settings deleted. Account {account_id} now uses global defaults.{Style.RESET_ALL}")
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
                 return  # Return to previous menu
 
         elif risk_choice == '11':
@@ -1499,12 +1506,12 @@ async def handle_risk_configuration():
 
         elif risk_choice == '2':
             # Configure per-account settings
-            account_id = input(f"\n{Fore.GREEN}Enter account number to configure: {Style.RESET_ALL}").strip()
+            account_id = (await prompt_async(f"\n{Fore.GREEN}Enter account number to configure: {Style.RESET_ALL}")).strip()
             if account_id:
                 await handle_account_specific_configuration(account_id)
             else:
                 print(f"{Fore.RED}Invalid account number{Style.RESET_ALL}")
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
 
         elif risk_choice == '3':
             # Return to main menu
@@ -1626,7 +1633,7 @@ async def handle_account_channel_configuration():
                 print(f"\n{Fore.YELLOW}⚠️  Removed {len(validation_result['removed'])} invalid account(s):{Style.RESET_ALL}")
                 for acc in validation_result['removed_accounts']:
                     print(f"   • {acc['name']} (#{acc['accNum']}, ID: {acc['id']}) - No longer active")
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
             else:
                 print(f"{Fore.GREEN}✅ All configured accounts are valid{Style.RESET_ALL}")
         else:
@@ -1634,7 +1641,7 @@ async def handle_account_channel_configuration():
 
     except Exception as e:
         print(f"{Fore.YELLOW}⚠️  Error validating accounts: {e}{Style.RESET_ALL}")
-        input("\nPress Enter to continue...")
+        await prompt_async("\nPress Enter to continue...")
 
     while True:
         choice = display_account_channel_menu()
@@ -1645,7 +1652,7 @@ async def handle_account_channel_configuration():
             all_channels = account_manager.get_all_monitored_channels()
             channel_names = await get_channel_names(all_channels)
             print(account_manager.get_summary(channel_names))
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif choice == '2':
             # Configure account channels
@@ -1674,18 +1681,18 @@ async def handle_account_channel_configuration():
                     setup_new_account(account_manager, accounts_data)
                 else:
                     print(f"{Fore.RED}Failed to retrieve accounts from TradeLocker{Style.RESET_ALL}")
-                    input("\nPress Enter to continue...")
+                    await prompt_async("\nPress Enter to continue...")
 
             except Exception as e:
                 print(f"{Fore.RED}Error setting up account: {e}{Style.RESET_ALL}")
-                input("\nPress Enter to continue...")
+                await prompt_async("\nPress Enter to continue...")
 
         elif choice == '7':
             # Export configuration
             config_json = account_manager.export_config()
             print(f"\n{Fore.CYAN}Configuration JSON:{Style.RESET_ALL}")
             print(config_json)
-            input("\nPress Enter to continue...")
+            await prompt_async("\nPress Enter to continue...")
 
         elif choice == '8':
             # Back to main menu
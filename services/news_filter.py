@@ -4,6 +4,7 @@ import aiohttp
 import logging
 import os
 from io import StringIO
+from operator import itemgetter
 from datetime import datetime, timedelta
 from pytz import timezone
 import pytz
@@ -79,20 +80,34 @@ class NewsEventFilter:
         try:
             self.news_events = []
             csv_file = StringIO(csv_content)
-            reader = csv.DictReader(csv_file)
+            reader = csv.reader(csv_file)
+
+            # Resolve column positions once from the header instead of building a dict per row
+            header = next(reader, [])
+            columns = {name.strip(): index for index, name in enumerate(header)}
+            title_index = columns.get('Title')
+            country_index = columns.get('Country')
+            date_index = columns.get('Date')
+            time_index = columns.get('Time')
+            impact_index = columns.get('Impact')
+            forecast_index = columns.get('Forecast')
+            previous_index = columns.get('Previous')
+
+            def field(row, index, default=''):
+                return row[index].strip() if index is not None and index < len(row) else default
 
             utc_timezone = timezone("UTC")  # CSV is in UTC
             local_timezone = timezone("America/New_York")  # Your correct local timezone
 
             for row in reader:
                 try:
-                    title = row.get('Title', '').strip()
-                    country = row.get('Country', '').strip()
-                    date_str = row.get('Date', '').strip()
-                    time_str = row.get('Time', '').strip()
-                    impact = row.get('Impact', '').strip().capitalize()
-                    forecast = row.get('Forecast', 'N/A').strip()
-                    previous = row.get('Previous', 'N/A').strip()
+                    title = field(row, title_index)
+                    country = field(row, country_index)
+                    date_str = field(row, date_index)
+                    time_str = field(row, time_index)
+                    impact = field(row, impact_index).capitalize()
+                    forecast = field(row, forecast_index, 'N/A')
+                    previous = field(row, previous_index, 'N/A')
 
                     if not title or not country:
                         continue
@@ -125,7 +140,7 @@ class NewsEventFilter:
                 except Exception as e:
                     logger.error(f"Skipping row due to error: {e}")
 
-            self.news_events.sort(key=lambda x: x['datetime'])
+            self.news_events.sort(key=itemgetter('datetime'))
 
         except Exception as e:
             logger.error(f"Error parsing calendar CSV: {e}", exc_info=True)
@@ -181,17 +196,12 @@ class NewsEventFilter:
             start_time = now
             end_time = now + timedelta(hours=hours)
 
-        # Filter events based on the calculated time window
-        filtered_events = []
-        for event in self.news_events:
-            event_time = event['datetime']
-
-            # Convert event time to UTC for proper comparison
-            if event_time.tzinfo != pytz.UTC:
-                event_time = event_time.astimezone(pytz.UTC)
-
-            if start_time <= event_time <= end_time:
-                filtered_events.append(event)
+        # Filter events based on the calculated time window. Event times are
+        # timezone-aware, so they compare by instant without converting each to UTC
+        filtered_events = [
+            event for event in self.news_events
+            if start_time <= event['datetime'] <= end_time
+        ]
 
         logger.info(f"Filter '{filter_type}' returned {len(filtered_events)} events")
         return filtered_events
@@ -251,7 +261,7 @@ class NewsEventFilter:
                 filtered_events.append(event)
 
         # Sort events by time
-        filtered_events.sort(key=lambda x: x['datetime'])
+        filtered_events.sort(key=itemgetter('datetime'))
 
         return filtered_events
 
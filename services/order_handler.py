@@ -257,6 +257,11 @@ async def place_order_with_caching(orders_client, selected_account, instrument_d
 
             order_ids = []
 
+            # Parts of the per-order success log that don't change between orders
+            order_label = order_type.upper()
+            side_label = order_side.upper()
+            runner_index = len(responses) - 1 if is_cfd else None
+
             for i, response in enumerate(responses):
                 # Handle exceptions
                 if isinstance(response, Exception):
@@ -276,12 +281,10 @@ async def place_order_with_caching(orders_client, selected_account, instrument_d
                         size_value = current_sizes[i]
 
                         # Check if this is a runner position (last position for CFD)
-                        is_runner = (is_cfd and i == len(responses) - 1)
-
-                        runner_tag = " (RUNNER)" if is_runner else ""
+                        runner_tag = " (RUNNER)" if i == runner_index else ""
                         logger.info(
-                            f"{colored_time}: ✅ {order_type.upper()} order placed{runner_tag} - "
-                            f"{instrument_name} {order_side.upper()} {size_value} lots @ {entry_point}, "
+                            f"{colored_time}: ✅ {order_label} order placed{runner_tag} - "
+                            f"{instrument_name} {side_label} {size_value} lots @ {entry_point}, "
                             f"SL: {stop_loss}, TP: {tp_value}"
                         )
                     else:
@@ -348,7 +351,8 @@ async def place_order_with_caching(orders_client, selected_account, instrument_d
 
 async def place_orders_with_risk_check(orders_client, accounts_client, quotes_client, selected_account,
                                        instrument_data, parsed_signal, position_sizes, risk_amount,
-                                       max_drawdown_balance, colored_time, message_id=None):
+                                       max_drawdown_balance, colored_time, message_id=None,
+                                       signal_timestamp=None):
     """
     Place orders with risk checks and cache the order IDs with message ID.
 
@@ -364,6 +368,7 @@ async def place_orders_with_risk_check(orders_client, accounts_client, quotes_cl
         max_drawdown_balance: Max drawdown balance (DEPRECATED - uses multi-account manager)
         colored_time: Formatted time
         message_id: Message ID for caching
+        signal_timestamp: time.monotonic() value when the signal was received
 
     Returns:
         dict: Result of order placement
@@ -380,7 +385,7 @@ async def place_orders_with_risk_check(orders_client, accounts_client, quotes_cl
             selected_account=selected_account,
             instrument_data=instrument_data,
             parsed_signal=parsed_signal,
-            signal_timestamp=None  # You can pass actual timestamp if available
+            signal_timestamp=signal_timestamp
         )
 
         # If signal is invalid, return immediately
@@ -439,7 +444,7 @@ async def place_orders_with_risk_check(orders_client, accounts_client, quotes_cl
         try:
             # Use instrument_data['name'] (the broker's actual instrument name)
             broker_instrument_name = instrument_data['name']
-            quote = await quotes_client.get_quote_async(updated_account, broker_instrument_name)
+            quote = await quotes_client.get_quote_async(updated_account, broker_instrument_name, instrument_data)
 
             if quote and 'd' in quote:
                 # Extract bid and ask prices
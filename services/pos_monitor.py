@@ -2,9 +2,21 @@ import asyncio
 import aiohttp
 import logging
 import time
+from collections import namedtuple
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent instrument lookups per poll
+MAX_CONCURRENT_LOOKUPS = 8
+
+# Leading columns of a TradeLocker position row
+Position = namedtuple('Position', 'position_id instrument_id route_id side quantity entry_price')
+
+
+def _adapt_position(raw):
+    """Wrap the leading columns of a raw position row in a Position"""
+    return Position(*raw[:6])
+
 
 async def monitor_existing_position(accounts_client, instruments_client, quotes_client,
                                     orders_client, selected_account, base_url, auth_token):
@@ -102,8 +114,38 @@ async def process_positions_parallel(positions, instruments_client, quotes_clien
     Process multiple positions in parallel for better efficiency
     """
     tasks = []
+    adapted_positions = []
+    for raw_position in positions:
+        try:
+            adapted_positions.append(_adapt_position(raw_position))
+        except TypeError:
+            # One malformed row shouldn't stop the rest of the poll
+            logger.warning(f"Skipping malformed position row: {raw_position!r}")
+
+    # Fetch every uncached instrument once, concurrently, before fanning out per position
+    missing_ids = list({p.instrument_id for p in adapted_positions if p.instrument_id not in instrument_cache})
+    if missing_ids:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+        async def fetch_instrument(instrument_id):
+            async with semaphore:
+                return await instruments_client.get_instrument_by_id_async(
+                    selected_account['id'],
+                    selected_account['accNum'],
+                    instrument_id
+                )
+
+        results = await asyncio.gather(
+            *(fetch_instrument(instrument_id) for instrument_id in missing_ids),
+            return_exceptions=True
+        )
+        for instrument_id, instrument_data in zip(missing_ids, results):
+            if isinstance(instrument_data, Exception):
+                logger.warning(f"Failed to fetch instrument {instrument_id}: {instrument_data}")
+            elif instrument_data:
+                instrument_cache[instrument_id] = instrument_data
 
-    for position_data in positions:
+    for position_data in adapted_positions:
         task = asyncio.create_task(
             monitor_single_position(
                 position_data,
@@ -131,10 +173,10 @@ async def monitor_single_position(position_data, instruments_client, quotes_clie
     Monitor a single position with improved caching and rate limiting
     """
     try:
-        position_id = position_data[0]  # Position ID
-        instrument_id = position_data[1]  # Instrument ID
-        entry_price = float(position_data[5])  # Entry price
-        side = position_data[3]  # Buy or Sell side ('buy' or 'sell')
+        position_id = position_data.position_id
+        instrument_id = position_data.instrument_id
+        entry_price = float(position_data.entry_price)
+        side = position_data.side  # 'buy' or 'sell'
 
         # Skip recently updated positions to avoid API rate limits
         current_time = time.time()
@@ -161,7 +203,7 @@ async def monitor_single_position(position_data, instruments_client, quotes_clie
         instrument_name = instrument_data['name']
 
         # Get real-time quote
-        real_time_quote = await quotes_client.get_quote_async(selected_account, instrument_name)
+        real_time_quote = await quotes_client.get_quote_async(selected_account, instrument_name, instrument_data)
 
         if not real_time_quote or 'd' not in real_time_quote:
             logger.warning(f"Failed to get quote for {instrument_name}")
@@ -182,7 +224,7 @@ async def monitor_single_position(position_data, instruments_client, quotes_clie
         )
 
     except Exception as e:
-        logger.error(f"Error monitoring position {position_data[0]}: {e}", exc_info=True)
+        logger.error(f"Error monitoring position {position_data.position_id}: {e}", exc_info=True)
 
 
 async def process_position_update(position_id, instrument_data, side, entry_price,
@@ -361,20 +403,25 @@ async def get_take_profits_for_position(position_id, instrument_id, selected_acc
             return None
 
         # Find the order that created this position
+        position_key = str(position_id)
         position_orders = []
         for order in orders['d']['orders']:
             # Check if this order is related to the position
             # You may need to adjust this logic based on how orders and positions are linked
-            if str(order.get('positionId', '')) == str(position_id):
+            if str(order.get('positionId', '')) == position_key:
                 position_orders.append(order)
 
-        # Extract take profit levels
+        # Extract take profit levels, de-duplicated through a set
         take_profits = []
+        seen_take_profits = set()
         for order in position_orders:
             # Extract take profit from order
             tp = order.get('takeProfit')
-            if tp and tp not in take_profits:
-                take_profits.append(float(tp))
+            if tp:
+                tp = float(tp)
+                if tp not in seen_take_profits:
+                    seen_take_profits.add(tp)
+                    take_profits.append(tp)
 
         # Sort take profits appropriately based on side
         # For buy orders: ascending order, for sell orders: descending order
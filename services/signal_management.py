@@ -2,14 +2,112 @@ import logging
 import asyncio
 import re
 import aiohttp
-import json
+import os
+import time
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from colorama import Fore, Style
 
 from config.order_cache import OrderCache
+from utils.json_utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a replied-to signal's orders to be stored before giving up
+ORDER_WAIT_TIMEOUT = 0.5
+
+# Seconds an account's pending-order/open-position snapshot is reused
+ACCOUNT_SNAPSHOT_TTL = 0.5
+
+# Upper bound on concurrent trade requests during a command fan-out
+MAX_CONCURRENT_REQUESTS = 8
+
+# Pip sizes: exact symbols first, then suffix rules, then keyword rules, in that order
+PIP_SIZE_EXACT = {"XAUUSD": 0.1, "GOLD": 0.1, "DJI30": 1.0, "US30": 1.0, "DOW": 1.0}
+PIP_SIZE_SUFFIXES = (("JPY", 0.01),)
+PIP_SIZE_KEYWORDS = ((("XAU", "GOLD"), 0.1), (("DJI30", "DOW", "US30"), 1.0))
+DEFAULT_PIP_SIZE = 0.0001  # Default for most forex pairs
+
+# Messages that are nothing but a command word
+SINGLE_WORD_COMMANDS = {
+    "close": "close",
+    "cancel": "cancel",
+    "be": "breakeven",
+    "breakeven": "breakeven"
+}
+
+# Commands recognised at the very start of a message; the group name is the command type
+LEADING_COMMAND_PATTERN = re.compile(r"(?P<close>close)|(?P<cancel>cancel)|(?P<breakeven>be |breakeven)")
+
+# TP hit/close announcements with a level number
+TP_COMPLETION_PATTERNS = [re.compile(pattern) for pattern in [
+    r"tp[\s\-_.]*(\d+)[\s\-_.]*(?:hit|reached|closed|achieved|secured|done)",  # "TP1 hit"
+    r"(?:hit|reached|closed|achieved|secured)[\s\-_.]*tp[\s\-_.]*(\d+)",  # "hit TP1"
+    r"^tp[\s\-_.]*(\d+)",  # "TP1" at start
+    r"^(?:close|exit)[\s\-_.]*tp[\s\-_.]*(\d+)",  # "close TP1" at start
+]]
+
+# Detailed instruction patterns, each class fused into one alternation so a message is scanned once per class
+# Detailed breakeven instructions
+BREAKEVEN_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r"break[\s\-_.]*even",
+    r"\bbe\b",
+    r"b[/\s\-_.]*e",
+    r"move[\s\-_.]*(?:sl|stop|loss)[\s\-_.]*to[\s\-_.]*(?:entry|be|breakeven)",
+    r"(?:sl|stop|loss)[\s\-_.]*(?:at|to)[\s\-_.]*(?:entry|be|breakeven)",
+    r"lock[\s\-_.]*(?:in)?[\s\-_.]*profits?",
+    r"secure[\s\-_.]*(?:your|the)?[\s\-_.]*profits?"
+]))
+
+# Detailed close instructions
+CLOSE_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r"close[\s\-_.]*(?:all|your|the|this|early|now)?[\s\-_.]*(?:positions?|trades?|orders?)",
+    r"exit[\s\-_.]*(?:all|your|the|this|early|now)?[\s\-_.]*(?:positions?|trades?|orders?)",
+    r"get[\s\-_.]*out",
+    r"take[\s\-_.]*profit[\s\-_.]*now",
+    r"exit[\s\-_.]*(?:all|now|market|immediately)",
+    r"close[\s\-_.]*(?:all|now|market|immediately|early)",  # Added explicit "close early" pattern
+    r"market[\s\-_.]*(?:doesn't|not|isn't)[\s\-_.]*(?:look|seem)[\s\-_.]*good"
+]))
+
+# Detailed cancel instructions
+CANCEL_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r"cancel[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
+    r"abort[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
+    r"remove[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
+    r"delete[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
+    r"stop[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
+    r"missed[\s\-_.]*(?:the|this)?[\s\-_.]*(?:entry|signal|opportunity)"
+]))
+
+# Generic TP mentions without a level number
+GENERIC_TP_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r"\btp\b",
+    r"take[\s\-_.]*profit",
+    r"target[\s\-_.]*hit",
+    r"target[\s\-_.]*reached"
+]))
+
+# Detailed command patterns as (command type, pattern), checked in priority order
+DETAILED_COMMAND_PATTERNS = (
+    ('breakeven', BREAKEVEN_PATTERN),
+    ('close', CLOSE_PATTERN),
+    ('cancel', CANCEL_PATTERN),
+)
+
+# Last-resort keywords as (command type, keywords), checked in priority order
+FALLBACK_COMMAND_KEYWORDS = (
+    ('close', ("close",)),
+    ('cancel', ("cancel",)),
+    ('breakeven', ("breakeven", " be ")),
+)
+
+
+def formatted_timestamp(log_entry):
+    """Format a message log entry's raw timestamp as an ISO-8601 string"""
+    return datetime.fromtimestamp(log_entry['_ts']).isoformat()
+
 
 class SignalManager:
     """
@@ -23,8 +121,13 @@ class SignalManager:
         self.instruments_client = instruments_client
         self.auth = auth_client
         self.order_cache = OrderCache()
-        self.message_logs = []
-        self.max_log_size = 200
+        self.max_log_size = int(os.getenv('MESSAGE_LOG_CAP', 200))
+        self.message_logs = deque(maxlen=self.max_log_size)
+        self._session = None
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Recent account snapshots: account ID -> (fetched_at, snapshot), with a lock per account
+        self._account_snapshots = {}
+        self._snapshot_locks = {}
 
         # Ensure initialization is complete
         self._init_complete = False
@@ -39,16 +142,12 @@ class SignalManager:
 
     def log_message(self, message_data):
         """Log message data for debugging"""
-        # Add timestamp
-        message_data['timestamp'] = datetime.now().isoformat()
+        # Add a raw timestamp; it is only formatted when logs are exported
+        message_data['_ts'] = time.time()
 
-        # Add to logs
+        # Add to logs - the deque drops the oldest entry once max_log_size is reached
         self.message_logs.append(message_data)
 
-        # Limit log size
-        if len(self.message_logs) > self.max_log_size:
-            self.message_logs = self.message_logs[-self.max_log_size:]
-
     def is_command_message(self, message):
         """
         Detect if a message contains a trading command using robust pattern matching
@@ -66,25 +165,23 @@ class SignalManager:
         message_lower = message.lower().strip()
 
         # Log the message we're trying to detect
-        logger.debug(f"Checking if message is a command: '{message_lower}'")
+        logger.debug("Checking if message is a command: '%s'", message_lower)
 
         # 1. SIMPLE KEYWORD DETECTION (Most reliable)
         # Check for the presence of simple command keywords at the beginning of the message
 
-        # Close detection - look for "close" at the beginning
-        if message_lower.startswith("close"):
-            logger.info(f"Detected CLOSE command: '{message_lower}'")
-            return 'close', None
+        # Bare command word - single hash lookup
+        command_type = SINGLE_WORD_COMMANDS.get(message_lower)
+        if command_type:
+            logger.info(f"Detected {command_type.upper()} command: '{message_lower}'")
+            return command_type, None
 
-        # Cancel detection - look for "cancel" at the beginning
-        if message_lower.startswith("cancel"):
-            logger.info(f"Detected CANCEL command: '{message_lower}'")
-            return 'cancel', None
-
-        # Breakeven detection - look for "be" or "breakeven" at the beginning
-        if message_lower.startswith(("be ", "breakeven")):
-            logger.info(f"Detected BREAKEVEN command: '{message_lower}'")
-            return 'breakeven', None
+        # "close", "cancel", "be " or "breakeven" at the beginning, checked in one pass
+        leading_match = LEADING_COMMAND_PATTERN.match(message_lower)
+        if leading_match:
+            command_type = leading_match.lastgroup
+            logger.info(f"Detected {command_type.upper()} command: '{message_lower}'")
+            return command_type, None
 
         # 2. CHECK FOR TP COMMANDS (HIGHEST PRIORITY)
 
@@ -96,15 +193,8 @@ class SignalManager:
         # Only check for TP commands if message is relatively short (likely an announcement)
         if word_count < 30:
             # Look for TP patterns with completion keywords
-            tp_completion_patterns = [
-                r"tp[\s\-_.]*(\d+)[\s\-_.]*(?:hit|reached|closed|achieved|secured|done)",  # "TP1 hit"
-                r"(?:hit|reached|closed|achieved|secured)[\s\-_.]*tp[\s\-_.]*(\d+)",  # "hit TP1"
-                r"^tp[\s\-_.]*(\d+)",  # "TP1" at start
-                r"^(?:close|exit)[\s\-_.]*tp[\s\-_.]*(\d+)",  # "close TP1" at start
-            ]
-
-            for pattern in tp_completion_patterns:
-                tp_match = re.search(pattern, message_lower)
+            for pattern in TP_COMPLETION_PATTERNS:
+                tp_match = pattern.search(message_lower)
                 if tp_match:
                     tp_level = int(tp_match.group(1))
                     logger.info(f"Detected TP command with level {tp_level}: '{message_lower}'")
@@ -112,86 +202,28 @@ class SignalManager:
 
         # 3. CHECK FOR DETAILED COMMAND PATTERNS
 
-        # More comprehensive patterns for breakeven
-        be_keywords = [
-            r"break[\s\-_.]*even",
-            r"\bbe\b",
-            r"b[/\s\-_.]*e",
-            r"move[\s\-_.]*(?:sl|stop|loss)[\s\-_.]*to[\s\-_.]*(?:entry|be|breakeven)",
-            r"(?:sl|stop|loss)[\s\-_.]*(?:at|to)[\s\-_.]*(?:entry|be|breakeven)",
-            r"lock[\s\-_.]*(?:in)?[\s\-_.]*profits?",
-            r"secure[\s\-_.]*(?:your|the)?[\s\-_.]*profits?"
-        ]
-
-        for pattern in be_keywords:
-            if re.search(pattern, message_lower):
-                logger.info(f"Detected BREAKEVEN command (detailed pattern): '{message_lower}'")
-                return 'breakeven', None
-
-        # More comprehensive patterns for closing
-        close_keywords = [
-            r"close[\s\-_.]*(?:all|your|the|this|early|now)?[\s\-_.]*(?:positions?|trades?|orders?)",
-            r"exit[\s\-_.]*(?:all|your|the|this|early|now)?[\s\-_.]*(?:positions?|trades?|orders?)",
-            r"get[\s\-_.]*out",
-            r"take[\s\-_.]*profit[\s\-_.]*now",
-            r"exit[\s\-_.]*(?:all|now|market|immediately)",
-            r"close[\s\-_.]*(?:all|now|market|immediately|early)",  # Added explicit "close early" pattern
-            r"market[\s\-_.]*(?:doesn't|not|isn't)[\s\-_.]*(?:look|seem)[\s\-_.]*good"
-        ]
-
-        for pattern in close_keywords:
-            if re.search(pattern, message_lower):
-                logger.info(f"Detected CLOSE command (detailed pattern): '{message_lower}'")
-                return 'close', None
-
-        # More comprehensive patterns for cancelling
-        cancel_keywords = [
-            r"cancel[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
-            r"abort[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
-            r"remove[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
-            r"delete[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
-            r"stop[\s\-_.]*(?:all|your|the|this|now)?[\s\-_.]*(?:positions?|trades?|orders?)?",
-            r"missed[\s\-_.]*(?:the|this)?[\s\-_.]*(?:entry|signal|opportunity)"
-        ]
-
-        for pattern in cancel_keywords:
-            if re.search(pattern, message_lower):
-                logger.info(f"Detected CANCEL command (detailed pattern): '{message_lower}'")
-                return 'cancel', None
+        for command_type, pattern in DETAILED_COMMAND_PATTERNS:
+            if pattern.search(message_lower):
+                logger.info(f"Detected {command_type.upper()} command (detailed pattern): '{message_lower}'")
+                return command_type, None
 
         # 4. CHECK FOR GENERIC TP COMMAND WITHOUT NUMBER
 
-        # Generic TP patterns without specific number
-        generic_tp_patterns = [
-            r"\btp\b",
-            r"take[\s\-_.]*profit",
-            r"target[\s\-_.]*hit",
-            r"target[\s\-_.]*reached"
-        ]
-
-        for pattern in generic_tp_patterns:
-            if re.search(pattern, message_lower):
-                # If we find a generic TP pattern without a number
-                logger.debug(f"Detected generic TP command: '{message_lower}'")
-                return 'tp', None
+        if GENERIC_TP_PATTERN.search(message_lower):
+            # If we find a generic TP pattern without a number
+            logger.debug(f"Detected generic TP command: '{message_lower}'")
+            return 'tp', None
 
         # 5. SUPER SIMPLE WORD MATCHING (FALLBACK)
 
         # Last resort - check if the key command words appear anywhere in the message
-        if "close" in message_lower:
-            logger.info(f"Detected CLOSE command (simple word match): '{message_lower}'")
-            return 'close', None
-
-        if "cancel" in message_lower:
-            logger.info(f"Detected CANCEL command (simple word match): '{message_lower}'")
-            return 'cancel', None
-
-        if "breakeven" in message_lower or " be " in message_lower:
-            logger.info(f"Detected BREAKEVEN command (simple word match): '{message_lower}'")
-            return 'breakeven', None
+        for command_type, keywords in FALLBACK_COMMAND_KEYWORDS:
+            if any(keyword in message_lower for keyword in keywords):
+                logger.info(f"Detected {command_type.upper()} command (simple word match): '{message_lower}'")
+                return command_type, None
 
         # Not a recognized command
-        logger.info(f"No command detected in message: '{message_lower}'")
+        logger.info("No command detected in message: '%s'", message_lower)
         return None, None
 
     async def store_orders(self, message_id, order_ids, take_profits, instrument=None):
@@ -200,7 +232,62 @@ class SignalManager:
             message_id, order_ids, take_profits, instrument
         )
 
-    async def cancel_order(self, account, order_id):
+    async def ensure_session(self):
+        """Ensure the aiohttp session used for trade requests exists"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+                json_serialize=json_dumps
+            )
+        return self._session
+
+    async def close(self):
+        """Close the aiohttp session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
+    async def _send_request(self, method, url, headers, body=None):
+        """
+        Send a single trade API request and collect the response status
+
+        Args:
+            method: HTTP method (DELETE, POST, PATCH)
+            url: Full request URL
+            headers: Request headers including authorization
+            body: Optional JSON body
+
+        Returns:
+            tuple: (status, error_text) - error_text is only read for non-200 responses
+        Note: A 401 renews the access token and retries the request once.
+        """
+        session = await self.ensure_session()
+        async with self._request_semaphore:
+            async with session.request(method, url, headers=headers, json=body) as response:
+                status = response.status
+                error_text = None if status == 200 else await response.text()
+
+            if status == 401:
+                # Token was rejected - renew it and retry once with fresh headers
+                self.auth.invalidate_token(headers["Authorization"].removeprefix("Bearer "))
+                headers = {**headers, "Authorization": f"Bearer {await self.auth.get_access_token_async()}"}
+                async with session.request(method, url, headers=headers, json=body) as response:
+                    status = response.status
+                    error_text = None if status == 200 else await response.text()
+
+            return status, error_text
+
+    async def _build_headers(self, account):
+        """Build the auth headers shared by the per-order trade requests"""
+        return {
+            "Authorization": f"Bearer {await self.auth.get_access_token_async()}",
+            "accNum": str(account['accNum']),
+            "Content-Type": "application/json"
+        }
+
+    async def cancel_order(self, account, order_id, headers=None):
         """
         Cancel a pending order using direct API call
         Note: This method attempts to cancel without checking status first
@@ -208,35 +295,37 @@ class SignalManager:
         Args:
             account: Account information
             order_id: Order ID to cancel
+            headers: Optional prebuilt request headers
 
         Returns:
             bool: Success status
         """
         try:
             url = f"{self.auth.base_url}/trade/orders/{order_id}"
-            headers = {
-                "Authorization": f"Bearer {await self.auth.get_access_token_async()}",
-                "accNum": str(account['accNum'])
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(url, headers=headers) as response:
-                    success = response.status == 200
-                    if success:
-                        logger.info(f"Successfully cancelled order {order_id}")
-                    else:
-                        # Don't treat as error if 404 - just means it was already executed or cancelled
-                        if response.status == 404:
-                            logger.info(f"Order {order_id} not found - may have been executed or already cancelled")
-                        else:
-                            error_text = await response.text()
-                            logger.warning(f"Failed to cancel order {order_id}: {response.status} - {error_text}")
-                    return success
+            if headers is None:
+                headers = await self._build_headers(account)
+
+            status, error_text = await self._send_request('DELETE', url, headers)
+            success = status == 200
+            if success:
+                self._account_snapshots.pop(account['id'], None)
+                logger.info("Successfully cancelled order %s", order_id)
+            elif status == 404:
+                # Don't treat as error if 404 - just means it was already executed or cancelled
+                logger.info("Order %s not found - may have been executed or already cancelled", order_id)
+            else:
+                logger.warning("Failed to cancel order %s: %s - %s", order_id, status, error_text)
+            return success
         except Exception as e:
             logger.error(f"Error cancelling order {order_id}: {e}")
             return False
 
-    async def close_position(self, account, position_id):
+    def _invalidate_positions(self, account):
+        """Drop the cached positions list for an account after a position changes"""
+        self.accounts_client.clear_cache_for_endpoint(f"trade/accounts/{account['id']}/positions")
+        self._account_snapshots.pop(account['id'], None)
+
+    async def close_position(self, account, position_id, headers=None):
         """
         Close a position using direct API call
         Note: This method attempts to close without checking status first
@@ -244,36 +333,167 @@ class SignalManager:
         Args:
             account: Account information
             position_id: Position ID to close
+            headers: Optional prebuilt request headers
 
         Returns:
             bool: Success status
         """
         try:
             url = f"{self.auth.base_url}/trade/positions/{position_id}"
-            headers = {
-                "Authorization": f"Bearer {await self.auth.get_access_token_async()}",
-                "accNum": str(account['accNum']),
-                "Content-Type": "application/json"
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers) as response:
-                    success = response.status == 200
-                    if success:
-                        logger.info(f"Successfully closed position {position_id}")
-                    else:
-                        # Don't treat as error if 404 - just means it was already closed
-                        if response.status == 404:
-                            logger.info(f"Position {position_id} not found - may have been already closed")
-                        else:
-                            error_text = await response.text()
-                            logger.warning(f"Failed to close position {position_id}: {response.status} - {error_text}")
-                    return success
+            if headers is None:
+                headers = await self._build_headers(account)
+
+            status, error_text = await self._send_request('POST', url, headers)
+            success = status == 200
+            if success:
+                logger.info("Successfully closed position %s", position_id)
+                self._invalidate_positions(account)
+            elif status == 404:
+                # Don't treat as error if 404 - just means it was already closed
+                logger.info("Position %s not found - may have been already closed", position_id)
+            else:
+                logger.warning("Failed to close position %s: %s - %s", position_id, status, error_text)
+            return success
         except Exception as e:
             logger.error(f"Error closing position {position_id}: {e}")
             return False
 
-    async def set_breakeven(self, account, position_id, entry_price=None):
+    async def get_account_snapshot(self, account):
+        """
+        Fetch the account's pending orders and open positions concurrently
+        A snapshot is reused for ACCOUNT_SNAPSHOT_TTL seconds, and concurrent callers for the
+        same account share one fetch.
+
+        Args:
+            account: Account information
+
+        Returns:
+            tuple: (pending_order_ids, open_position_ids) as sets of str - either is None if its request failed
+        """
+        account_id = account['id']
+        lock = self._snapshot_locks.setdefault(account_id, asyncio.Lock())
+        async with lock:
+            cached = self._account_snapshots.get(account_id)
+            if cached and time.monotonic() - cached[0] < ACCOUNT_SNAPSHOT_TTL:
+                return cached[1]
+
+            orders, positions = await asyncio.gather(
+                self.orders_client.get_orders_async(account_id, account['accNum']),
+                self.accounts_client.get_current_position_async(account_id, account['accNum']),
+                return_exceptions=True
+            )
+
+            def row_ids(response, key):
+                if not isinstance(response, dict):
+                    return None
+                rows = response.get('d', {}).get(key) or []
+                return {str(row.get('id') if isinstance(row, dict) else row[0]) for row in rows}
+
+            snapshot = row_ids(orders, 'orders'), row_ids(positions, 'positions')
+            # Only complete snapshots are reused
+            if None not in snapshot:
+                self._account_snapshots[account_id] = (time.monotonic(), snapshot)
+            return snapshot
+
+    async def _known_position_ids(self, account, order_ids):
+        """
+        Find cached IDs that the account snapshot shows as open positions and not as pending orders.
+        These can be closed directly instead of first attempting a cancel that is bound to fail.
+
+        Args:
+            account: Account information
+            order_ids: Cached order/position IDs for a signal
+
+        Returns:
+            set: IDs known to be open positions
+        """
+        pending_order_ids, open_position_ids = await self.get_account_snapshot(account)
+        if not open_position_ids:
+            return set()
+        pending_order_ids = pending_order_ids or set()
+        return {
+            order_id for order_id in order_ids
+            if str(order_id) in open_position_ids and str(order_id) not in pending_order_ids
+        }
+
+    async def _cancel_orders(self, account, order_ids, headers=None):
+        """
+        Cancel several pending orders concurrently
+        Concurrency is bounded by the request semaphore in _send_request.
+
+        Args:
+            account: Account information
+            order_ids: Order IDs to cancel
+            headers: Optional prebuilt request headers
+
+        Returns:
+            dict: Success status keyed by order ID
+        """
+        results = await asyncio.gather(
+            *(self.cancel_order(account, order_id, headers) for order_id in order_ids),
+            return_exceptions=True
+        )
+        return {order_id: result is True for order_id, result in zip(order_ids, results)}
+
+    async def _cancel_or_close(self, account, order_id, headers=None):
+        """
+        Cancel an order, closing it as a position straight away if the cancel fails
+
+        Returns:
+            str: 'cancelled', 'closed' or None if neither worked
+        """
+        if await self.cancel_order(account, order_id, headers):
+            return 'cancelled'
+        if await self.close_position(account, order_id, headers):
+            return 'closed'
+        return None
+
+    async def _cancel_or_close_orders(self, account, order_ids, headers=None):
+        """
+        Cancel-or-close several orders concurrently
+        Each order's close fallback starts as soon as its own cancel fails, rather than
+        after every cancel has finished.
+
+        Args:
+            account: Account information
+            order_ids: Cached order/position IDs
+            headers: Optional prebuilt request headers
+
+        Returns:
+            dict: Outcome ('cancelled', 'closed' or None) keyed by order ID
+        """
+        results = await asyncio.gather(
+            *(self._cancel_or_close(account, order_id, headers) for order_id in order_ids),
+            return_exceptions=True
+        )
+        return {
+            order_id: None if isinstance(result, Exception) else result
+            for order_id, result in zip(order_ids, results)
+        }
+
+    async def _close_positions(self, account, position_ids, headers=None):
+        """
+        Close several positions concurrently
+        Note: No batch close is used. TradeLocker's DELETE positions endpoint closes every
+        position on the account (or instrument), which would also hit positions opened by
+        other signals, so one close request is sent per position instead.
+
+        Args:
+            account: Account information
+            position_ids: Position IDs to close (any iterable)
+            headers: Optional prebuilt request headers
+
+        Returns:
+            dict: Success status keyed by position ID
+        """
+        position_ids = list(position_ids)
+        results = await asyncio.gather(
+            *(self.close_position(account, position_id, headers) for position_id in position_ids),
+            return_exceptions=True
+        )
+        return {position_id: result is True for position_id, result in zip(position_ids, results)}
+
+    async def set_breakeven(self, account, position_id, entry_price=None, headers=None):
         """
         Set stop loss to breakeven for a position - simplified implementation
 
@@ -281,6 +501,7 @@ class SignalManager:
             account: Account information
             position_id: Position ID
             entry_price: Optional entry price from cache
+            headers: Optional prebuilt request headers
 
         Returns:
             bool: Success status
@@ -288,11 +509,8 @@ class SignalManager:
         try:
             # Create API request for setting stop loss to entry price
             url = f"{self.auth.base_url}/trade/positions/{position_id}"
-            headers = {
-                "Authorization": f"Bearer {await self.auth.get_access_token_async()}",
-                "accNum": str(account['accNum']),
-                "Content-Type": "application/json"
-            }
+            if headers is None:
+                headers = await self._build_headers(account)
 
             # Use provided entry price or default to 0 (which will fail)
             stop_loss = entry_price
@@ -304,16 +522,14 @@ class SignalManager:
             body = {"stopLoss": stop_loss}
 
             # Execute the PATCH request
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(url, headers=headers, json=body) as response:
-                    success = response.status == 200
-                    if success:
-                        logger.info(f"Successfully moved SL to breakeven for position {position_id}: {stop_loss}")
-                    else:
-                        error_text = await response.text()
-                        logger.warning(
-                            f"Failed to update SL for position {position_id}: {response.status} - {error_text}")
-                    return success
+            status, error_text = await self._send_request('PATCH', url, headers, body)
+            success = status == 200
+            if success:
+                logger.info("Successfully moved SL to breakeven for position %s: %s", position_id, stop_loss)
+                self._invalidate_positions(account)
+            else:
+                logger.warning("Failed to update SL for position %s: %s - %s", position_id, status, error_text)
+            return success
 
         except Exception as e:
             logger.error(f"Error moving SL to breakeven: {e}")
@@ -331,14 +547,20 @@ class SignalManager:
         """
         instrument_upper = instrument_name.upper() if instrument_name else ""
 
-        if instrument_upper.endswith("JPY"):
-            return 0.01
-        elif "XAU" in instrument_upper or "GOLD" in instrument_upper:
-            return 0.1
-        elif any(name in instrument_upper for name in ["DJI30", "DOW", "US30"]):
-            return 1.0
-        else:
-            return 0.0001  # Default for most forex pairs
+        # Common symbols resolve with one lookup
+        pip_size = PIP_SIZE_EXACT.get(instrument_upper)
+        if pip_size is not None:
+            return pip_size
+
+        for suffix, pip_size in PIP_SIZE_SUFFIXES:
+            if instrument_upper.endswith(suffix):
+                return pip_size
+
+        for keywords, pip_size in PIP_SIZE_KEYWORDS:
+            if any(keyword in instrument_upper for keyword in keywords):
+                return pip_size
+
+        return DEFAULT_PIP_SIZE
 
     async def handle_message(self, message, account, colored_time, reply_to_msg_id=None, message_id=None):
         """
@@ -367,7 +589,7 @@ class SignalManager:
 
         # Check if we have a reply_to_msg_id to associate with orders
         if not reply_to_msg_id:
-            logger.debug(f"{colored_time}: Command detected but no reply-to message ID")
+            logger.debug("%s: Command detected but no reply-to message ID", colored_time)
             message_log['match_method'] = 'none_no_reply_id'
             self.log_message(message_log)
             return False, None
@@ -377,14 +599,14 @@ class SignalManager:
         cache_key = f"{account_id}_{reply_to_msg_id}" if reply_to_msg_id else str(account_id)
 
         # Log detailed information about the IDs we're working with
-        logger.info(
-            f"{colored_time}: Looking for cached orders with cache_key: {cache_key}")
+        logger.info("%s: Looking for cached orders with cache_key: %s", colored_time, cache_key)
 
-        # Try to get orders associated with the original message
-        cached_orders = self.order_cache.get_orders(cache_key)
+        # Try to get orders associated with the original message, allowing for a reply
+        # that arrives while the signal's orders are still being placed
+        cached_orders = await self.order_cache.wait_for_orders(cache_key, ORDER_WAIT_TIMEOUT)
 
         if not cached_orders:
-            logger.info(f"{colored_time}: No cached orders found for message ID {reply_to_msg_id}")
+            logger.info("%s: No cached orders found for message ID %s", colored_time, reply_to_msg_id)
             message_log['match_method'] = 'none_no_cached_orders'
             self.log_message(message_log)
             return False, None
@@ -394,13 +616,18 @@ class SignalManager:
         cached_orders.get('take_profits', [])
         instrument = cached_orders.get('instrument')
 
-        logger.info(
-            f"{colored_time}: {Fore.CYAN}Found {len(order_ids)} cached orders for message {reply_to_msg_id}. "
-            f"Command: {command_type}{' TP' + str(tp_level) if tp_level else ''}{Style.RESET_ALL}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"{colored_time}: {Fore.CYAN}Found {len(order_ids)} cached orders for message {reply_to_msg_id}. "
+                f"Command: {command_type}{' TP' + str(tp_level) if tp_level else ''}{Style.RESET_ALL}"
+            )
+
+        # Build the request headers once for every order touched by this command
+        headers = await self._build_headers(account)
 
         # Initialize counters
         success_count = 0
+        processed_ids = []
         total_count = len(order_ids)
         message_log['match_method'] = 'cached_orders'
 
@@ -411,129 +638,114 @@ class SignalManager:
             # Don't close active positions
 
             logger.info(
-                f"{colored_time}: TP command received - attempting to cancel ALL {len(order_ids)} pending orders")
-
-            # Process all orders in parallel for speed
-            cancel_tasks = []
-            for order_id in order_ids:
-                task = asyncio.create_task(self.cancel_order(account, order_id))
-                cancel_tasks.append((order_id, task))
-
-            # Wait for all cancel operations to complete
-            for order_id, task in cancel_tasks:
-                try:
-                    success = await task
-                    if success:
-                        # Remove the order from cache after successful cancellation
-                        self.order_cache.remove_order(cache_key, order_id)
-                        logger.info(f"{colored_time}: {Fore.YELLOW}Cancelled pending order {order_id}{Style.RESET_ALL}")
-                        success_count += 1
-                    else:
-                        logger.info(f"{colored_time}: Order {order_id} is not a pending order or already executed")
-                except Exception as e:
-                    logger.error(f"{colored_time}: Error cancelling order {order_id}: {e}")
+                "%s: TP command received - attempting to cancel ALL %d pending orders", colored_time, len(order_ids))
+
+            # Cancel all orders concurrently
+            cancel_results = await self._cancel_orders(account, order_ids, headers)
+            for order_id, success in cancel_results.items():
+                if success:
+                    # Remove the order from cache after successful cancellation
+                    processed_ids.append(order_id)
+                    logger.info("%s: %sCancelled pending order %s%s", colored_time, Fore.YELLOW, order_id, Style.RESET_ALL)
+                    success_count += 1
+                else:
+                    logger.info("%s: Order %s is not a pending order or already executed", colored_time, order_id)
 
             # If all orders were successfully cancelled, remove the message
+            # Drop every processed order from the cache in one update
+            self.order_cache.remove_orders(cache_key, processed_ids)
+
             if success_count > 0:
                 remaining_orders = await self.get_remaining_orders_count(cache_key)
                 if remaining_orders == 0:
                     self.order_cache.remove_message(cache_key)
-                    logger.info(
-                        f"{colored_time}: {Fore.GREEN}All orders cancelled, removed message from cache{Style.RESET_ALL}")
+                    logger.info("%s: %sAll orders cancelled, removed message from cache%s",
+                                colored_time, Fore.GREEN, Style.RESET_ALL)
 
         elif command_type == 'close':
             # Use the same parallel processing logic that works for TP and cancel
 
-            logger.info(
-                f"{colored_time}: Close command received - attempting to close ALL {len(order_ids)} orders/positions")
-
-            # Process all orders in parallel for speed
-            close_tasks = []
-
-            for order_id in order_ids:
-                # For close command, we first try cancel_order to handle pending orders
-
-                task = asyncio.create_task(self.cancel_order(account, order_id))
-                close_tasks.append(('cancel', order_id, task))
-
-            # Wait for all cancel operations to complete
-            for op_type, order_id, task in close_tasks:
+            logger.info("%s: Close command received - attempting to close ALL %d orders/positions",
+                        colored_time, len(order_ids))
 
-                try:
-                    success = await task
-                    if success:
-                        # Successfully cancelled as pending order
+            # IDs already known to be open positions are closed directly, alongside the cancels
+            known_position_ids = await self._known_position_ids(account, order_ids)
+            direct_close_task = asyncio.create_task(self._close_positions(account, known_position_ids, headers))
 
-                        self.order_cache.remove_order(cache_key, order_id)
-                        logger.info(f"{colored_time}: {Fore.YELLOW}Cancelled pending order {order_id}{Style.RESET_ALL}")
-                        success_count += 1
+            # For close command, we first try cancel_order to handle pending orders,
+            # and close as a position any order that isn't pending
+            cancel_ids = [order_id for order_id in order_ids if order_id not in known_position_ids]
+            outcomes = await self._cancel_or_close_orders(account, cancel_ids, headers)
 
-                    else:
-                        # If not a pending order, try to close as position
-                        close_success = await self.close_position(account, order_id)
-
-                        if close_success:
-                            self.order_cache.remove_order(cache_key, order_id)
-                            logger.info(
-                                f"{colored_time}: {Fore.GREEN}Closed active position {order_id}{Style.RESET_ALL}")
-                            success_count += 1
-                        else:
-                            logger.info(f"{colored_time}: Failed to close/cancel order/position {order_id}")
-
-                except Exception as e:
-                    logger.error(f"{colored_time}: Error processing order {order_id}: {e}")
+            close_results = await direct_close_task
+            for order_id, outcome in outcomes.items():
+                if outcome == 'cancelled':
+                    # Successfully cancelled as pending order
+                    processed_ids.append(order_id)
+                    logger.info("%s: %sCancelled pending order %s%s", colored_time, Fore.YELLOW, order_id, Style.RESET_ALL)
+                    success_count += 1
+                else:
+                    close_results[order_id] = outcome == 'closed'
+            for order_id, close_success in close_results.items():
+                if close_success:
+                    processed_ids.append(order_id)
+                    logger.info("%s: %sClosed active position %s%s", colored_time, Fore.GREEN, order_id, Style.RESET_ALL)
+                    success_count += 1
+                else:
+                    logger.info("%s: Failed to close/cancel order/position %s", colored_time, order_id)
 
             # If we successfully processed any orders, check if we should remove the message
+            # Drop every processed order from the cache in one update
+            self.order_cache.remove_orders(cache_key, processed_ids)
+
             if success_count > 0:
                 remaining_orders = await self.get_remaining_orders_count(cache_key)
                 if remaining_orders == 0:
                     self.order_cache.remove_message(cache_key)
-                    logger.info(
-                        f"{colored_time}: {Fore.GREEN}All orders processed, removed message from cache{Style.RESET_ALL}")
+                    logger.info("%s: %sAll orders processed, removed message from cache%s",
+                                colored_time, Fore.GREEN, Style.RESET_ALL)
 
         elif command_type == 'cancel':
             # Use the same logic that works for TP command
             # Process all orders in parallel for efficiency
 
-            logger.info(f"{colored_time}: Cancel command received - attempting to cancel ALL {len(order_ids)} orders")
-
-            # Process all orders in parallel for speed
-
-            cancel_tasks = []
-            for order_id in order_ids:
-                task = asyncio.create_task(self.cancel_order(account, order_id))
-
-                cancel_tasks.append((order_id, task))
-
-            # Wait for all cancel operations to complete
-            for order_id, task in cancel_tasks:
-                try:
-                    success = await task
-                    if success:
-                        # Remove the order from cache after successful cancellation
-                        self.order_cache.remove_order(cache_key, order_id)
-                        logger.info(f"{colored_time}: {Fore.YELLOW}Cancelled order {order_id}{Style.RESET_ALL}")
-                        success_count += 1
-
-                    else:
-                        # If cancellation didn't work, try to close as position
-                        close_success = await self.close_position(account, order_id)
-                        if close_success:
-                            self.order_cache.remove_order(cache_key, order_id)
-                            logger.info(f"{colored_time}: {Fore.GREEN}Closed position {order_id}{Style.RESET_ALL}")
-                            success_count += 1
-                        else:
-                            logger.info(f"{colored_time}: Failed to cancel order or close position {order_id}")
-                except Exception as e:
-                    logger.error(f"{colored_time}: Error processing order {order_id}: {e}")
+            logger.info("%s: Cancel command received - attempting to cancel ALL %d orders", colored_time, len(order_ids))
+
+            # IDs already known to be open positions are closed directly, alongside the cancels
+            known_position_ids = await self._known_position_ids(account, order_ids)
+            direct_close_task = asyncio.create_task(self._close_positions(account, known_position_ids, headers))
+
+            # Cancel the remaining orders concurrently - if cancellation doesn't work, close as position
+            cancel_ids = [order_id for order_id in order_ids if order_id not in known_position_ids]
+            outcomes = await self._cancel_or_close_orders(account, cancel_ids, headers)
+
+            close_results = await direct_close_task
+            for order_id, outcome in outcomes.items():
+                if outcome == 'cancelled':
+                    # Remove the order from cache after successful cancellation
+                    processed_ids.append(order_id)
+                    logger.info("%s: %sCancelled order %s%s", colored_time, Fore.YELLOW, order_id, Style.RESET_ALL)
+                    success_count += 1
+                else:
+                    close_results[order_id] = outcome == 'closed'
+            for order_id, close_success in close_results.items():
+                if close_success:
+                    processed_ids.append(order_id)
+                    logger.info("%s: %sClosed position %s%s", colored_time, Fore.GREEN, order_id, Style.RESET_ALL)
+                    success_count += 1
+                else:
+                    logger.info("%s: Failed to cancel order or close position %s", colored_time, order_id)
 
             # If we successfully processed any orders, check if we should remove the message
+            # Drop every processed order from the cache in one update
+            self.order_cache.remove_orders(cache_key, processed_ids)
+
             if success_count > 0:
                 remaining_orders = await self.get_remaining_orders_count(cache_key)
                 if remaining_orders == 0:
                     self.order_cache.remove_message(cache_key)
-                    logger.info(
-                        f"{colored_time}: {Fore.GREEN}All orders processed, removed message from cache{Style.RESET_ALL}")
+                    logger.info("%s: %sAll orders processed, removed message from cache%s",
+                                colored_time, Fore.GREEN, Style.RESET_ALL)
 
         elif command_type == 'breakeven':
             # For breakeven command, use entry price from cache
@@ -541,15 +753,18 @@ class SignalManager:
             entry_price = cached_orders.get('entry_price')
 
             if not entry_price:
-                logger.warning(f"{colored_time}: No entry price found in cache")
-            # Process each order
-            for order_id in order_ids:
-                be_success = await self.set_breakeven(account, order_id, entry_price)
-                if be_success:
-                    logger.info(f"{colored_time}: {Fore.CYAN}Set breakeven for position {order_id}{Style.RESET_ALL}")
+                logger.warning("%s: No entry price found in cache", colored_time)
+            # Move every position's stop concurrently
+            be_results = await asyncio.gather(
+                *(self.set_breakeven(account, order_id, entry_price, headers) for order_id in order_ids),
+                return_exceptions=True
+            )
+            for order_id, be_success in zip(order_ids, be_results):
+                if be_success is True:
+                    logger.info("%s: %sSet breakeven for position %s%s", colored_time, Fore.CYAN, order_id, Style.RESET_ALL)
                     success_count += 1
                     continue
-                logger.warning(f"{colored_time}: Failed to set breakeven for position {order_id}")
+                logger.warning("%s: Failed to set breakeven for position %s", colored_time, order_id)
         # Return the result
         result = {
             "command_type": command_type,
@@ -578,5 +793,10 @@ class SignalManager:
         """Export message logs for debugging/analysis"""
         logs_to_export = self.message_logs
         if limit:
-            logs_to_export = logs_to_export[-limit:]
-        return json.dumps(logs_to_export, indent=2)
+            # Take the tail without copying the whole deque first
+            logs_to_export = islice(logs_to_export, max(len(logs_to_export) - limit, 0), None)
+        logs_to_export = [
+            {**{key: value for key, value in log.items() if key != '_ts'}, 'timestamp': formatted_timestamp(log)}
+            for log in logs_to_export
+        ]
+        return json_dumps(logs_to_export, pretty=True)
@@ -1,13 +1,87 @@
 import logging
+import time
 from datetime import datetime
+from functools import lru_cache
 import os
 
 logger = logging.getLogger(__name__)
 
+# (substring, pip value) checked in order - JPY pairs, then indices, then gold
+PIP_VALUE_MARKERS = (
+    ("JPY", 0.01),
+    ("DJI30", 1.0), ("DOW", 1.0), ("US30", 1.0), ("NAS100", 1.0), ("SPX500", 1.0),
+    ("XAUUSD", 0.1), ("GOLD", 0.1),
+)
+DEFAULT_PIP_VALUE = 0.0001
+
+# (substring, max_slippage_pips key) checked in order - gold, then Dow indices
+SLIPPAGE_MARKERS = (
+    ("XAUUSD", 'XAUUSD'), ("GOLD", 'XAUUSD'),
+    ("DJI30", 'DJI30'), ("US30", 'DJI30'), ("DOW", 'DJI30'),
+)
+
+# Exact symbols resolved without scanning: symbol -> (pip value, max_slippage_pips key)
+INSTRUMENT_CLASS_BY_SYMBOL = {
+    "XAUUSD": (0.1, 'XAUUSD'), "GOLD": (0.1, 'XAUUSD'),
+    "DJI30": (1.0, 'DJI30'), "US30": (1.0, 'DJI30'), "DOW": (1.0, 'DJI30'),
+    "NAS100": (1.0, 'DEFAULT'), "SPX500": (1.0, 'DEFAULT'),
+}
+
+# Common currency codes used to recognise forex pairs
+FOREX_CURRENCIES = frozenset(['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD'])
+
+
+@lru_cache(maxsize=512)
+def classify_instrument(instrument_name):
+    """
+    Classify an instrument for signal validation.
+    Memoized per name - the instrument universe is small, so after warm-up every call is a hash lookup.
+
+    Args:
+        instrument_name: Broker instrument name
+
+    Returns:
+        tuple: (pip_value, max_slippage_pips key)
+    """
+    instrument_upper = instrument_name.upper()
+
+    # Common symbols are a single dict lookup
+    exact_class = INSTRUMENT_CLASS_BY_SYMBOL.get(instrument_upper)
+    if exact_class:
+        return exact_class
+
+    # Plain forex pairs (both legs currency codes) skip the marker scans entirely
+    if len(instrument_upper) == 6:
+        base, quote = instrument_upper[:3], instrument_upper[3:]
+        if base in FOREX_CURRENCIES and quote in FOREX_CURRENCIES:
+            return (0.01 if 'JPY' in (base, quote) else DEFAULT_PIP_VALUE), 'FOREX'
+
+    pip_value = DEFAULT_PIP_VALUE  # Standard forex pairs
+    for marker, marker_pip_value in PIP_VALUE_MARKERS:
+        if marker in instrument_upper:
+            pip_value = marker_pip_value
+            break
+
+    # Check specific instruments first
+    slippage_key = next(
+        (marker_key for marker, marker_key in SLIPPAGE_MARKERS if marker in instrument_upper), None)
+    if slippage_key is None:
+        # Check if it's a forex pair (6 characters, either leg a common currency code)
+        if len(instrument_name) == 6 and (
+                instrument_upper[:3] in FOREX_CURRENCIES or instrument_upper[3:] in FOREX_CURRENCIES):
+            slippage_key = 'FOREX'
+        else:
+            slippage_key = 'DEFAULT'
+
+    return pip_value, slippage_key
+
 
 class SignalValidator:
     """Validates trading signals before execution"""
 
+    # Fixed per-instance state; no __dict__ is needed
+    __slots__ = ('max_slippage_pips', 'max_signal_age', 'quote_cache_ttl', '_quote_cache')
+
     def __init__(self):
         # Maximum allowed slippage in pips for different instrument types
         self.max_slippage_pips = {
@@ -19,43 +93,35 @@ class SignalValidator:
         }
         # Maximum signal age in seconds
         self.max_signal_age = int(os.getenv('MAX_SIGNAL_AGE_SECONDS', 180))  # 3 minutes
+        # How long a fetched quote is reused for signals on the same instrument
+        self.quote_cache_ttl = float(os.getenv('QUOTE_CACHE_TTL_SECONDS', 0.25))
+        # Recent quotes per (account, instrument): key -> (fetched_at, quote)
+        self._quote_cache = {}
 
     def _get_pip_value(self, instrument_name):
         """Determine pip value based on instrument"""
-        instrument_upper = instrument_name.upper()
-
-        # Japanese Yen pairs
-        if instrument_upper.endswith("JPY") or "JPY" in instrument_upper:
-            return 0.01
-
-        # Indices
-        if any(idx in instrument_upper for idx in ["DJI30", "DOW", "US30", "NAS100", "SPX500"]):
-            return 1.0
-
-        # Gold
-        if any(gold in instrument_upper for gold in ["XAUUSD", "GOLD"]):
-            return 0.1
-
-        # Standard forex pairs
-        return 0.0001
+        return classify_instrument(instrument_name)[0]
 
     def _get_max_slippage(self, instrument_name):
         """Get maximum allowed slippage for instrument"""
-        instrument_upper = instrument_name.upper()
+        return self.max_slippage_pips[classify_instrument(instrument_name)[1]]
 
-        # Check specific instruments first
-        if any(gold in instrument_upper for gold in ["XAUUSD", "GOLD"]):
-            return self.max_slippage_pips['XAUUSD']
-
-        if any(idx in instrument_upper for idx in ["DJI30", "US30", "DOW"]):
-            return self.max_slippage_pips['DJI30']
-
-        # Check if it's a forex pair (6 characters, contains common currency codes)
-        common_currencies = ['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD']
-        if len(instrument_name) == 6 and any(curr in instrument_upper for curr in common_currencies):
-            return self.max_slippage_pips['FOREX']
+    async def _get_quote(self, quotes_client, account, instrument_name, instrument_data):
+        """
+        Get the current quote, reusing one fetched within the last quote_cache_ttl seconds.
+        Concurrent requests for the same quote are coalesced by the quotes endpoint itself.
+        Note: TradeLocker's quotes endpoint takes one instrument per request, so bursts
+        can't be batched into a single call.
+        """
+        key = (account['id'], instrument_name)
+        cached = self._quote_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.quote_cache_ttl:
+            return cached[1]
 
-        return self.max_slippage_pips['DEFAULT']
+        quote = await quotes_client.get_quote_async(account, instrument_name, instrument_data)
+        if quote:
+            self._quote_cache[key] = (time.monotonic(), quote)
+        return quote
 
     async def validate_signal_before_execution(
             self,
@@ -68,6 +134,10 @@ class SignalValidator:
         """
         Validates if a signal is still valid for execution.
 
+        Args:
+            signal_timestamp: When the signal was received - a time.monotonic() value,
+                or a datetime for callers that only have wall-clock time
+
         Returns:
             dict: {
                 'valid': bool,
@@ -87,7 +157,10 @@ class SignalValidator:
 
             # Step 1: Check signal age if timestamp provided
             if signal_timestamp:
-                age_seconds = (datetime.now() - signal_timestamp).total_seconds()
+                if isinstance(signal_timestamp, datetime):
+                    age_seconds = (datetime.now() - signal_timestamp).total_seconds()
+                else:
+                    age_seconds = time.monotonic() - signal_timestamp
                 if age_seconds > self.max_signal_age:
                     return {
                         'valid': False,
@@ -95,10 +168,10 @@ class SignalValidator:
                     }
 
             # Step 2: Get current market price
-            quote = await quotes_client.get_quote_async(selected_account, instrument_name)
+            quote = await self._get_quote(quotes_client, selected_account, instrument_name, instrument_data)
 
             if not quote or 'd' not in quote:
-                logger.warning(f"Could not get quote for {instrument_name}. Allowing limit order.")
+                logger.warning("Could not get quote for %s. Allowing limit order.", instrument_name)
                 return {
                     'valid': True,
                     'order_type': 'limit',
@@ -113,19 +186,20 @@ class SignalValidator:
             current_price = ask_price if 'buy' in signal_side else bid_price
 
             # Step 3: Calculate price difference in pips
-            pip_value = self._get_pip_value(instrument_name)
+            pip_value, slippage_key = classify_instrument(instrument_name)
             price_diff = abs(signal_entry - current_price)
             price_diff_pips = price_diff / pip_value
 
             # Get maximum allowed slippage
-            max_slippage = self._get_max_slippage(instrument_name)
+            max_slippage = self.max_slippage_pips[slippage_key]
 
             # Step 4: For LIMIT orders, allow them regardless of distance from current price
             # The provider is predicting future price movement, so distance is intentional
             if 'limit' in original_order_type:
                 logger.debug(
                     "LIMIT order detected - allowing signal regardless of price distance "
-                    f"({price_diff_pips:.1f} pips from current price)"
+                    "(%.1f pips from current price)",
+                    price_diff_pips
                 )
                 return {
                     'valid': True,
@@ -147,7 +221,8 @@ class SignalValidator:
             # Case 1: Price is very close or moved favorably -> Execute as MARKET
             if favorable_move or price_diff_pips <= 10:
                 logger.info(
-                    f"   ✓ Signal valid - Price favorable or close ({price_diff_pips:.1f} pips), using MARKET"
+                    "   ✓ Signal valid - Price favorable or close (%.1f pips), using MARKET",
+                    price_diff_pips
                 )
                 return {
                     'valid': True,
@@ -160,7 +235,8 @@ class SignalValidator:
             # Case 2: Within acceptable slippage -> Execute as MARKET with warning
             elif price_diff_pips <= max_slippage:
                 logger.info(
-                    f"   ⚠ Signal valid but slipped {price_diff_pips:.1f} pips (max: {max_slippage}), using MARKET"
+                    "   ⚠ Signal valid but slipped %.1f pips (max: %s), using MARKET",
+                    price_diff_pips, max_slippage
                 )
                 return {
                     'valid': True,
@@ -173,7 +249,8 @@ class SignalValidator:
             # Case 3: Price too far -> Place as LIMIT order (provider prediction)
             else:
                 logger.info(
-                    f"   📋 Price {price_diff_pips:.1f} pips away - placing LIMIT order at {signal_entry}"
+                    "   📋 Price %.1f pips away - placing LIMIT order at %s",
+                    price_diff_pips, signal_entry
                 )
                 return {
                     'valid': True,
@@ -183,7 +260,7 @@ class SignalValidator:
                 }
 
         except Exception as e:
-            logger.error(f"Error validating signal: {e}", exc_info=True)
+            logger.error("Error validating signal: %s", e, exc_info=True)
             # On error, allow limit order as fallback
             return {
                 'valid': True,
@@ -5,6 +5,8 @@ E8 Markets API Testing Script
 Test and explore the E8 Markets platform authentication and interface
 """
 import os
+import re
+import socket
 import time
 import json
 from datetime import datetime
@@ -14,10 +16,49 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 
 # Load environment variables
 load_dotenv()
 
+# Terms that indicate what kind of page we landed on
+PAGE_PATTERNS = {
+    'login': ['login', 'sign in', 'authenticate'],
+    'password': ['password', 'passwd', 'pwd'],
+    'email': ['email', 'e-mail', 'username'],
+    'broker': ['broker', 'account', 'select'],
+    'dashboard': ['dashboard', 'trading', 'positions'],
+    'api': ['api', 'endpoint', 'rest'],
+    'websocket': ['websocket', 'ws://', 'wss://']
+}
+PAGE_PATTERN_RES = {
+    key: re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    for key, terms in PAGE_PATTERNS.items()
+}
+
+# Login form lookups, each a single DOM query
+PASSWORD_FIELD_SELECTOR = "#password, input[name='password'], input[type='password']"
+SUBMIT_BUTTON_SELECTOR = "button[type='submit'], button.login, button.signin"
+SUBMIT_BUTTON_XPATH = (
+    "//button[contains(text(), 'Login') or contains(text(), 'Sign In') or contains(text(), 'Submit')]"
+)
+
+# Collects everything analyze_page_structure prints in a single round-trip
+PAGE_STRUCTURE_SCRIPT = """
+const all = (tag) => Array.from(document.getElementsByTagName(tag));
+return {
+    inputs: all('input').map(e => ({
+        type: e.type, name: e.name, id: e.id, placeholder: e.placeholder
+    })),
+    buttons: all('button').map(e => ({
+        text: e.innerText.trim(), type: e.type, class: e.className
+    })),
+    links: all('a').map(e => ({text: e.innerText.trim(), href: e.href || null})),
+    forms: document.forms.length,
+    iframes: all('iframe').length
+};
+"""
+
 
 class E8MarketsAPITester:
     """Test and explore E8 Markets platform"""
@@ -28,12 +69,40 @@ class E8MarketsAPITester:
         self.password = 'n2S=VA2B'
         self.partner_id = '2'
         self.login_url = f"https://mtr.e8markets.com/match-trader-edge/multi-broker-access/available-brokers/login?partnerId={self.partner_id}&email={self.email}"
+        # Keep one Chrome alive across runs and attach to it over its debugging port
+        # Opt-in: the profile keeps the E8 session cookies (chrome_profile/ is git-ignored)
+        self.reuse_browser = os.getenv('E8_REUSE_BROWSER', 'false').lower() == 'true'
+        self.debug_port = int(os.getenv('E8_CHROME_DEBUG_PORT', '9222'))
+        self.profile_dir = os.path.abspath(os.getenv('E8_CHROME_PROFILE_DIR', './chrome_profile'))
+
+    def _debug_port_open(self):
+        """Return True if a browser is already listening on the debugging port"""
+        try:
+            with socket.create_connection(('127.0.0.1', self.debug_port), timeout=0.5):
+                return True
+        except OSError:
+            return False
 
     def initialize_browser(self):
         """Initialize Chrome browser"""
         print("🚀 Initializing browser...")
 
+        if self.reuse_browser and self._debug_port_open():
+            attach_options = Options()
+            attach_options.add_experimental_option('debuggerAddress', f'127.0.0.1:{self.debug_port}')
+            try:
+                self.driver = webdriver.Chrome(options=attach_options)
+                print(f"✅ Attached to running browser on port {self.debug_port}")
+                return
+            except Exception as e:
+                print(f"⚠️  Could not attach to running browser, launching a new one: {e}")
+
         chrome_options = Options()
+        if self.reuse_browser:
+            chrome_options.add_argument(f'--remote-debugging-port={self.debug_port}')
+            chrome_options.add_argument(f'--user-data-dir={self.profile_dir}')
+            # Leave Chrome running after this script exits so the next run can attach
+            chrome_options.add_experimental_option('detach', True)
         # Run in visible mode to see what's happening
         chrome_options.add_argument('--start-maximized')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
@@ -50,8 +119,19 @@ class E8MarketsAPITester:
     def navigate_to_login(self):
         """Navigate to login URL"""
         print(f"\n🌐 Navigating to: {self.login_url}")
+        # The URL may not change (a reused browser can already be on the login page),
+        # so wait for the old document to be replaced rather than for a new URL
+        old_document = self.driver.find_element(By.TAG_NAME, 'html')
         self.driver.get(self.login_url)
-        time.sleep(3)
+        try:
+            # Wait for the navigation to land instead of sleeping a fixed time
+            document_replaced = EC.staleness_of(old_document)
+            WebDriverWait(self.driver, 10).until(
+                lambda d: document_replaced(d)
+                and d.execute_script('return document.readyState') == 'complete'
+            )
+        except TimeoutException:
+            print("⚠️  Page did not finish loading within 10s")
         print(f"✅ Current URL: {self.driver.current_url}")
         print(f"📄 Page Title: {self.driver.title}")
 
@@ -60,41 +140,27 @@ class E8MarketsAPITester:
         print("\n🔍 Analyzing page structure...")
 
         try:
-            # Get all input fields
-            inputs = self.driver.find_elements(By.TAG_NAME, "input")
+            # Read every field in one script call instead of one RPC per attribute
+            page = self.driver.execute_script(PAGE_STRUCTURE_SCRIPT)
+
+            inputs = page['inputs']
             print(f"\n📝 Found {len(inputs)} input fields:")
             for i, inp in enumerate(inputs):
-                inp_type = inp.get_attribute('type')
-                inp_name = inp.get_attribute('name')
-                inp_id = inp.get_attribute('id')
-                inp_placeholder = inp.get_attribute('placeholder')
-                print(f"  {i+1}. Type: {inp_type}, Name: {inp_name}, ID: {inp_id}, Placeholder: {inp_placeholder}")
-
-            # Get all buttons
-            buttons = self.driver.find_elements(By.TAG_NAME, "button")
+                print(f"  {i+1}. Type: {inp['type']}, Name: {inp['name']}, ID: {inp['id']}, Placeholder: {inp['placeholder']}")
+
+            buttons = page['buttons']
             print(f"\n🔘 Found {len(buttons)} buttons:")
             for i, btn in enumerate(buttons):
-                btn_text = btn.text
-                btn_type = btn.get_attribute('type')
-                btn_class = btn.get_attribute('class')
-                print(f"  {i+1}. Text: '{btn_text}', Type: {btn_type}, Class: {btn_class}")
+                print(f"  {i+1}. Text: '{btn['text']}', Type: {btn['type']}, Class: {btn['class']}")
 
-            # Get all links
-            links = self.driver.find_elements(By.TAG_NAME, "a")
+            links = page['links']
             print(f"\n🔗 Found {len(links)} links:")
             for i, link in enumerate(links[:10]):  # Show first 10
-                link_text = link.text
-                link_href = link.get_attribute('href')
-                if link_text or link_href:
-                    print(f"  {i+1}. Text: '{link_text}', Href: {link_href}")
-
-            # Check for forms
-            forms = self.driver.find_elements(By.TAG_NAME, "form")
-            print(f"\n📋 Found {len(forms)} forms")
+                if link['text'] or link['href']:
+                    print(f"  {i+1}. Text: '{link['text']}', Href: {link['href']}")
 
-            # Check for iframes
-            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-            print(f"\n🖼️  Found {len(iframes)} iframes")
+            print(f"\n📋 Found {page['forms']} forms")
+            print(f"\n🖼️  Found {page['iframes']} iframes")
 
         except Exception as e:
             print(f"❌ Error analyzing page: {e}")
@@ -116,20 +182,8 @@ class E8MarketsAPITester:
 
         source = self.driver.page_source
 
-        # Check for common patterns
-        patterns = {
-            'login': ['login', 'sign in', 'authenticate'],
-            'password': ['password', 'passwd', 'pwd'],
-            'email': ['email', 'e-mail', 'username'],
-            'broker': ['broker', 'account', 'select'],
-            'dashboard': ['dashboard', 'trading', 'positions'],
-            'api': ['api', 'endpoint', 'rest'],
-            'websocket': ['websocket', 'ws://', 'wss://']
-        }
-
-        found_patterns = {}
-        for key, terms in patterns.items():
-            found_patterns[key] = any(term in source.lower() for term in terms)
+        # One case-insensitive search per group instead of lowering the whole page
+        found_patterns = {key: bool(regex.search(source)) for key, regex in PAGE_PATTERN_RES.items()}
 
         print("\n🔎 Pattern Detection:")
         for key, found in found_patterns.items():
@@ -146,24 +200,15 @@ class E8MarketsAPITester:
         print(f"\n🔐 Attempting login with email: {self.email}")
 
         try:
-            # Look for password field
+            # Look for password field with one compound selector
             password_field = None
-            selectors = [
-                (By.ID, "password"),
-                (By.NAME, "password"),
-                (By.CSS_SELECTOR, "input[type='password']"),
-                (By.XPATH, "//input[@type='password']")
-            ]
-
-            for by, selector in selectors:
-                try:
-                    password_field = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    print(f"✅ Found password field: {by}={selector}")
-                    break
-                except:
-                    continue
+            try:
+                password_field = WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, PASSWORD_FIELD_SELECTOR))
+                )
+                print(f"✅ Found password field: {PASSWORD_FIELD_SELECTOR}")
+            except TimeoutException:
+                pass
 
             if not password_field:
                 print("❌ No password field found on page")
@@ -179,27 +224,23 @@ class E8MarketsAPITester:
             print("✅ Password entered")
             time.sleep(1)
 
-            # Find submit button
+            # Find submit button: compound CSS first, text match only if that misses
             submit_button = None
-            button_selectors = [
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.XPATH, "//button[contains(text(), 'Login')]"),
-                (By.XPATH, "//button[contains(text(), 'Sign In')]"),
-                (By.XPATH, "//button[contains(text(), 'Submit')]")
-            ]
-
-            for by, selector in button_selectors:
-                try:
-                    submit_button = self.driver.find_element(by, selector)
+            for by, selector in ((By.CSS_SELECTOR, SUBMIT_BUTTON_SELECTOR), (By.XPATH, SUBMIT_BUTTON_XPATH)):
+                matches = self.driver.find_elements(by, selector)
+                if matches:
+                    submit_button = matches[0]
                     print(f"✅ Found submit button: {by}={selector}")
                     break
-                except:
-                    continue
 
             if submit_button:
+                pre_url = self.driver.current_url
                 submit_button.click()
                 print("✅ Submit button clicked")
-                time.sleep(5)
+                try:
+                    WebDriverWait(self.driver, 10).until(EC.url_changes(pre_url))
+                except TimeoutException:
+                    print("⚠️  URL did not change within 10s after submitting")
 
                 print(f"\n📍 After login URL: {self.driver.current_url}")
                 print(f"📄 After login title: {self.driver.title}")
@@ -313,12 +354,19 @@ class E8MarketsAPITester:
             # Cleanup
             if self.driver:
                 print("\n🔒 Closing browser...")
-                self.driver.quit()
-                print("✅ Browser closed")
+                self.close()
+                if self.reuse_browser:
+                    print(f"✅ Driver stopped, browser left running on port {self.debug_port}")
+                else:
+                    print("✅ Browser closed")
 
     def close(self):
-        """Close browser"""
-        if self.driver:
+        """Close browser, or only the driver when the browser is kept for reuse"""
+        if not self.driver:
+            return
+        if self.reuse_browser:
+            self.driver.service.stop()
+        else:
             self.driver.quit()
 
 
@@ -3,47 +3,55 @@
 Debug script to analyze economic events CSV and identify date filtering issues
 """
 
-import csv
 import sys
 from datetime import datetime
+from functools import lru_cache
 
+import pandas as pd
 
-def debug_csv_dates(csv_path):
-    """
-    Analyze dates in the CSV file and print distribution by day
-    """
-    print(f"Analyzing CSV file: {csv_path}")
+# Impact levels reported per date, in column order
+IMPACT_LEVELS = ['high', 'medium', 'low']
+
+# Date formats the calendar has been seen in, in probe order
+DATE_FORMATS = ['%m-%d-%Y', '%Y-%m-%d']
 
-    # Count events by date
-    date_counts = {}
-    unique_dates = set()
 
+@lru_cache(maxsize=4096)
+def matches_date_format(date_str, date_format):
+    """Return True when date_str parses with date_format (cached per pair)."""
     try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            # Skip header row
-            reader = csv.DictReader(file)
+        datetime.strptime(date_str, date_format)
+        return True
+    except ValueError:
+        return False
 
-            for row in reader:
-                date_str = row.get('Date', '').strip()
-                impact = row.get('Impact', '').strip()
 
-                if date_str:
-                    # Add to date counts
-                    if date_str not in date_counts:
-                        date_counts[date_str] = {'high': 0, 'medium': 0, 'low': 0, 'total': 0}
+def detect_date_format(date_str, formats):
+    """Return the first format in formats that parses date_str, or 'unknown'."""
+    return next((fmt for fmt in formats if matches_date_format(date_str, fmt)), 'unknown')
 
-                    date_counts[date_str]['total'] += 1
 
-                    # Count by impact
-                    impact_lower = impact.lower()
-                    if impact_lower == 'high':
-                        date_counts[date_str]['high'] += 1
-                    elif impact_lower == 'medium':
-                        date_counts[date_str]['medium'] += 1
-                    elif impact_lower == 'low':
-                        date_counts[date_str]['low'] += 1
+def debug_csv_dates(csv_path):
+    """
+    Analyze dates in the CSV file and print distribution by day
+    """
+    print(f"Analyzing CSV file: {csv_path}")
 
-                    unique_dates.add(date_str)
+    try:
+        events = pd.read_csv(csv_path, usecols=['Date', 'Impact'], dtype='string', encoding='utf-8')
+        events['Date'] = events['Date'].str.strip()
+        events['Impact'] = events['Impact'].str.strip().str.lower()
+        events = events[events['Date'].fillna('') != '']
+
+        # Count events by date, then by impact level within each date
+        date_counts = events.groupby('Date').size().to_frame('total')
+        impact_counts = (
+            events.groupby(['Date', 'Impact']).size()
+            .unstack(fill_value=0)
+            .reindex(columns=IMPACT_LEVELS, fill_value=0)
+        )
+        date_counts = date_counts.join(impact_counts).fillna(0).astype(int)
+        unique_dates = list(date_counts.index)
 
         # Report findings
         print(f"\nFound {len(unique_dates)} unique dates in the CSV")
@@ -52,24 +60,25 @@ def debug_csv_dates(csv_path):
         print(f"{'Date':<12} {'Total':<8} {'High':<8} {'Medium':<8} {'Low':<8}")
         print("-" * 60)
 
-        for date_str in sorted(date_counts.keys()):
-            counts = date_counts[date_str]
-            print(f"{date_str:<12} {counts['total']:<8} {counts['high']:<8} {counts['medium']:<8} {counts['low']:<8}")
+        # Walk the count columns side by side rather than building a Series per row
+        columns = [date_counts[column].to_numpy() for column in ['total'] + IMPACT_LEVELS]
+        for date_str, total, high, medium, low in zip(date_counts.index, *columns):
+            print(f"{date_str:<12} {total:<8} {high:<8} {medium:<8} {low:<8}")
 
         # Check date format consistency
         print("\nChecking date format consistency...")
         date_formats = {}
 
+        # Probe the first date for the file's format so the rest only pay
+        # for one strptime; other formats are tried only when it misses
+        primary_format = detect_date_format(unique_dates[0], DATE_FORMATS) if unique_dates else 'unknown'
+        probe_order = [primary_format] + [fmt for fmt in DATE_FORMATS if fmt != primary_format]
+
         for date_str in unique_dates:
-            try:
-                datetime.strptime(date_str, '%m-%d-%Y')
-                format_str = '%m-%d-%Y'
-            except ValueError:
-                try:
-                    datetime.strptime(date_str, '%Y-%m-%d')
-                    format_str = '%Y-%m-%d'
-                except ValueError:
-                    format_str = 'unknown'
+            if matches_date_format(date_str, primary_format):
+                format_str = primary_format
+            else:
+                format_str = detect_date_format(date_str, probe_order[1:])
 
             if format_str not in date_formats:
                 date_formats[format_str] = []
@@ -2,15 +2,23 @@
 """
 Comprehensive Telegram Channel ID Finder
 Shows multiple ID formats to help identify the correct one for your bot.
+
+Usage:
+    python tools/get_telegram_channels.py          # List all chats once
+    python tools/get_telegram_channels.py --repl   # Stay connected and list on demand
 """
 
 import os
 import sys
 import asyncio
+import argparse
+import threading
+from contextlib import asynccontextmanager
+from io import StringIO
+from operator import attrgetter
 from dotenv import load_dotenv
 from telethon import TelegramClient, functions
 from telethon.tl.types import Channel, Chat, User
-from tabulate import tabulate
 from colorama import init, Fore, Style
 
 # Initialize colorama for colored output
@@ -30,9 +38,18 @@ if not API_ID or not API_HASH:
     print("API_HASH=your_api_hash")
     sys.exit(1)
 
+# Maximum GetFullChannelRequest calls in flight at once
+FULL_CHANNEL_CONCURRENCY = 10
+
+# Fixed-width chat table: IDs have bounded widths, so there is no need to scan
+# every cell for column sizes. Long names and usernames are truncated.
+CHAT_TABLE_FORMAT = "{:<40.40} {:<20.20} {:<10} {:>15} {:>15} {:>17} {:>17}"
+CHAT_TABLE_HEADERS = ("Name", "Username", "Type", "Raw ID", "-100 Format", "-1001 Format", "-1002 Format")
+
 
-async def list_all_chat_formats():
-    """Connect to Telegram and list all possible chat ID formats"""
+@asynccontextmanager
+async def open_client():
+    """Connect to Telegram (logging in if needed) and disconnect on exit"""
     print(f"{Fore.CYAN}Connecting to Telegram...{Style.RESET_ALL}")
 
     # Create the client
@@ -50,21 +67,60 @@ async def list_all_chat_formats():
             await client.sign_in(phone, code)
             print(f"{Fore.GREEN}Successfully logged in!{Style.RESET_ALL}")
 
+        yield client
+    finally:
+        # Disconnect
+        await client.disconnect()
+
+
+async def list_all_chat_formats(client):
+    """List all possible chat ID formats using a connected client"""
+    try:
         print(f"{Fore.CYAN}Retrieving dialogs...{Style.RESET_ALL}")
 
-        # Get all dialogs (chats, channels, etc.)
-        dialogs = await client.get_dialogs()
+        # Get full channel info while later dialog pages are still arriving,
+        # capped to avoid FLOOD_WAIT
+        semaphore = asyncio.Semaphore(FULL_CHANNEL_CONCURRENCY)
 
-        # Prepare data for display
-        all_chats = []
+        async def get_full_channel(entity):
+            async with semaphore:
+                return await client(functions.channels.GetFullChannelRequest(channel=entity))
 
-        for dialog in dialogs:
-            entity = dialog.entity
+        # Get all dialogs (chats, channels, etc.), skipping users and bots
+        chat_entities = []
+        full_channel_tasks = {}
+        try:
+            async for dialog in client.iter_dialogs():
+                entity = dialog.entity
+                if isinstance(entity, User):
+                    continue
+                chat_entities.append(entity)
+                if isinstance(entity, Channel):
+                    full_channel_tasks[entity.id] = asyncio.ensure_future(get_full_channel(entity))
+        except BaseException:
+            # Listing failed or was cancelled - don't leave lookups running behind us
+            for task in full_channel_tasks.values():
+                task.cancel()
+            await asyncio.gather(*full_channel_tasks.values(), return_exceptions=True)
+            raise
 
-            # Skip users and bots
-            if isinstance(entity, User):
-                continue
+        full_channels = await asyncio.gather(*full_channel_tasks.values(), return_exceptions=True)
+        real_api_ids = {
+            # The actual ID used by the API may be available here; errors are ignored
+            channel_id: full_channel.full_chat.id
+            for channel_id, full_channel in zip(full_channel_tasks, full_channels)
+            if not isinstance(full_channel, Exception) and hasattr(full_channel, 'full_chat')
+        }
 
+        # Order by name up front so the table rows and the examples below can
+        # both be produced in this single pass
+        chat_entities.sort(key=attrgetter('title'))
+
+        # Prepare data for display
+        all_chats = []
+        examples = StringIO()
+
+        for entity in chat_entities:
             dialog_id = entity.id
             dialog_title = entity.title
 
@@ -84,51 +140,30 @@ async def list_all_chat_formats():
                 chat_type = "Unknown"
 
             # Generate multiple ID formats
-            id_formats = {
-                "Raw ID": dialog_id,
-                "Negative ID": -dialog_id,
-                "-100 Format": -1000000000000 - dialog_id,  # Example format
-                "-1001 Format": -1001000000000 - dialog_id,  # Another common format
-                "-1002 Format": -1002000000000 - dialog_id  # Yet another format
-            }
-
-            # For channels, also try to get real API ID
-            real_api_id = None
-            if isinstance(entity, Channel):
-                try:
-                    # Get full channel info
-                    full_channel = await client(functions.channels.GetFullChannelRequest(
-                        channel=entity
-                    ))
-                    # The actual ID used by the API may be available here
-                    if hasattr(full_channel, 'full_chat'):
-                        real_api_id = full_channel.full_chat.id
-                        id_formats["Real API ID"] = real_api_id
-                except Exception:
-                    pass  # Ignore errors in getting full channel info
+            id_minus100 = -1000000000000 - dialog_id  # Example format
+            id_minus1001 = -1001000000000 - dialog_id  # Another common format
+            id_minus1002 = -1002000000000 - dialog_id  # Yet another format
 
             # Add to our results
-            all_chats.append([
-                dialog_title,
-                username_str,
-                chat_type,
-                id_formats.get("Raw ID"),
-                id_formats.get("-100 Format"),
-                id_formats.get("-1001 Format"),
-                id_formats.get("-1002 Format")
-            ])
-
-        # Sort by name
-        all_chats.sort(key=lambda x: x[0])
+            all_chats.append([dialog_title, username_str, chat_type, dialog_id, id_minus100, id_minus1001, id_minus1002])
+
+            # Example for this chat, printed after the table
+            examples.write(
+                f"\n{chat_type}: {Fore.GREEN}{dialog_title}{Style.RESET_ALL}\n"
+                f"  Standard (-100) format: self.channel_ids.append({id_minus100})\n"
+                f"  Extended (-1001) format: self.channel_ids.append({id_minus1001})\n"
+                f"  Newer (-1002) format: self.channel_ids.append({id_minus1002})\n"
+            )
+            # For channels, also show the real API ID when it was found
+            real_api_id = real_api_ids.get(dialog_id) if isinstance(entity, Channel) else None
+            if real_api_id is not None:
+                examples.write(f"  Real API ID: {real_api_id}\n")
 
         # Display the results
         if all_chats:
             print(f"\n{Fore.GREEN}{Style.BRIGHT}ALL CHATS WITH MULTIPLE ID FORMATS:{Style.RESET_ALL}")
-            print(tabulate(
-                all_chats,
-                headers=["Name", "Username", "Type", "Raw ID", "-100 Format", "-1001 Format", "-1002 Format"],
-                tablefmt="pretty"
-            ))
+            header = CHAT_TABLE_FORMAT.format(*CHAT_TABLE_HEADERS)
+            print("\n".join([header, "-" * len(header)] + [CHAT_TABLE_FORMAT.format(*chat) for chat in all_chats]))
 
             # Show verification instructions
             print(f"\n{Fore.CYAN}How to verify the correct ID:{Style.RESET_ALL}")
@@ -138,17 +173,7 @@ async def list_all_chat_formats():
 
             # Show example for each channel
             print(f"\n{Fore.YELLOW}Examples for your bot:{Style.RESET_ALL}")
-            for chat in all_chats:
-                name = chat[0]
-                chat_type = chat[2]
-                id_minus100 = chat[4]
-                id_minus1001 = chat[5]
-                id_minus1002 = chat[6]
-
-                print(f"\n{chat_type}: {Fore.GREEN}{name}{Style.RESET_ALL}")
-                print(f"  Standard (-100) format: self.channel_ids.append({id_minus100})")
-                print(f"  Extended (-1001) format: self.channel_ids.append({id_minus1001})")
-                print(f"  Newer (-1002) format: self.channel_ids.append({id_minus1002})")
+            print(examples.getvalue(), end='')
         else:
             print(f"{Fore.YELLOW}No chats found.{Style.RESET_ALL}")
 
@@ -156,11 +181,84 @@ async def list_all_chat_formats():
         print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
         import traceback
         traceback.print_exc()
-    finally:
-        # Disconnect
-        await client.disconnect()
+
+
+async def read_line(prompt):
+    """
+    Read a line from stdin without blocking the event loop.
+
+    input() runs on a daemon thread rather than the default executor, so a prompt
+    still waiting when the loop shuts down (e.g. after Ctrl-C) can't hold up exit.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+
+    def read():
+        try:
+            line = input(prompt)
+        except Exception as e:  # EOFError when stdin is closed
+            callback = (deliver, future.set_exception, e)
+        else:
+            callback = (deliver, future.set_result, line)
+        try:
+            loop.call_soon_threadsafe(*callback)
+        except RuntimeError:
+            pass  # Loop already closed - nobody is waiting for this line
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def interactive_mode(client):
+    """Keep one connection open and run commands without redoing the handshake"""
+    print(f"\n{Fore.CYAN}Connected. Commands: list, help, quit{Style.RESET_ALL}")
+
+    while True:
+        try:
+            # Read input off the event loop so Telethon keeps the connection alive meanwhile
+            command = (await read_line("\n> ")).strip().lower()
+        except EOFError:
+            break
+        except asyncio.CancelledError:
+            # Ctrl-C: asyncio.run cancels this task; let open_client disconnect on the way out
+            print(f"\n{Fore.CYAN}Exiting interactive mode...{Style.RESET_ALL}")
+            raise
+
+        if command in ('quit', 'exit'):
+            break
+        elif command == 'list':
+            await list_all_chat_formats(client)
+        elif command == 'help':
+            print("Available commands: list, help, quit")
+        elif command:
+            print(f"{Fore.YELLOW}Unknown command. Type 'help' for available commands{Style.RESET_ALL}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Telegram Channel ID Finder")
+    parser.add_argument('--repl', action='store_true',
+                        help='Stay connected and accept commands instead of listing once')
+    args = parser.parse_args()
+
+    try:
+        async with open_client() as client:
+            if args.repl:
+                await interactive_mode(client)
+            else:
+                await list_all_chat_formats(client)
+    except Exception as e:
+        print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
+        import traceback
+        traceback.print_exc()
 
 
 if __name__ == "__main__":
     # Run the async function
-    asyncio.run(list_all_chat_formats())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass  # Interrupted from the prompt; the client was already disconnected
@@ -6,6 +6,7 @@ Usage:
     python news_check.py list --today --impact high     # List today's high-impact events only
     python news_check.py list --week --impact all       # List all events this week
     python news_check.py list --hours 168 --sort-impact # List events for next 7 days sorted by impact
+    python news_check.py list --week --limit 10         # Show only the next 10 events this week
 """
 
 from services.news_filter import NewsEventFilter
@@ -14,6 +15,11 @@ import sys
 import asyncio
 import logging
 import argparse
+import heapq
+from itertools import chain
+from operator import itemgetter
+from collections import Counter
+from functools import lru_cache
 from colorama import init, Fore, Style
 from tabulate import tabulate
 
@@ -32,9 +38,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger('news_check')
 
+# Sort rank per impact level; anything else sorts last
+IMPACT_PRIORITY = {"high": 1, "medium": 2, "low": 3}
 
+# Sort key for chronological order
+EVENT_TIME = itemgetter('datetime')
+
+
+@lru_cache(maxsize=16)
 def colorize_impact(impact):
-    """Returns a colorized version of the impact level"""
+    """Returns a colorized version of the impact level (memoized - only a few distinct impacts)"""
     impact_lower = impact.lower() if impact else ""
     if impact_lower == "high":
         return Fore.RED + "High" + Style.RESET_ALL
@@ -46,56 +59,85 @@ def colorize_impact(impact):
 
 
 def filter_by_impact(events, impact_level=None):
-    """Filter events by impact level"""
+    """Filter events by impact level, lazily - callers materialize only what they need"""
     if not impact_level or impact_level.lower() == 'all':
-        return events
+        return iter(events)
 
     # Convert to lowercase for case-insensitive comparison
     impact_level = impact_level.lower()
-    return [event for event in events if event.get('impact', '').lower() == impact_level]
-
+    return (event for event in events if (event.get('impact') or '').lower() == impact_level)
 
-def sort_events_by_impact(events):
-    """Sort events by impact level (High > Medium > Low)"""
-    impact_priority = {"high": 1, "medium": 2, "low": 3}
-    return sorted(events, key=lambda e: impact_priority.get(e.get('impact', '').lower(), 4))
 
+def _use_partial_sort(events, limit):
+    """A heap select beats a full sort when only a small prefix is shown"""
+    return limit is not None and limit < len(events) // 2
 
-def sort_events_by_datetime(events):
-    """Sort events by datetime"""
-    return sorted(events, key=lambda e: e['datetime'])
 
+def sort_events_by_impact(events, limit=None):
+    """Sort events by impact level (High > Medium > Low), keeping only the first limit if given"""
+    # Decorate once so each impact is lowered once; the index keeps the sort stable
+    keyed = [(IMPACT_PRIORITY.get((e.get('impact') or '').lower(), 4), i, e) for i, e in enumerate(events)]
+    if _use_partial_sort(events, limit):
+        keyed = heapq.nsmallest(limit, keyed)
+    else:
+        keyed.sort()
+        keyed = keyed[:limit]
+    return [e for _, _, e in keyed]
+
+
+def sort_events_by_datetime(events, limit=None):
+    """Sort events by datetime, keeping only the first limit if given"""
+    if _use_partial_sort(events, limit):
+        return heapq.nsmallest(limit, events, key=EVENT_TIME)
+    return sorted(events, key=EVENT_TIME)[:limit]
+
+
+async def display_events(news_filter, time_filter, summary=False, impact_level=None, sort_by_impact=False,
+                         events=None, limit=None):
+    """
+    Display economic events based on time filter with optional filtering and sorting.
+    Pass events to reuse a list already fetched with get_events_by_filter(time_filter),
+    and limit to show only the first N events after sorting.
+    """
+    # Normalize the impact level once; 'all' means no impact filter
+    impact_level = impact_level.lower() if impact_level else None
+    if impact_level == 'all':
+        impact_level = None
+    impact_label = impact_level.upper() if impact_level else None
 
-async def display_events(news_filter, time_filter, summary=False, impact_level=None, sort_by_impact=False):
-    """Display economic events based on time filter with optional filtering and sorting"""
     # Get all events for the time period
-    upcoming_events = news_filter.get_events_by_filter(time_filter)
+    upcoming_events = events if events is not None else news_filter.get_events_by_filter(time_filter)
 
     if not upcoming_events:
         print(f"{Fore.YELLOW}No economic events found for {time_filter}.{Style.RESET_ALL}")
         return
 
     # Filter by impact level if specified
-    if impact_level and impact_level.lower() != 'all':
+    if impact_level:
         filtered_events = filter_by_impact(upcoming_events, impact_level)
-        if not filtered_events:
-            print(f"{Fore.YELLOW}No {impact_level.upper()} impact events found for {time_filter}.{Style.RESET_ALL}")
+        first_event = next(filtered_events, None)
+        if first_event is None:
+            print(f"{Fore.YELLOW}No {impact_label} impact events found for {time_filter}.{Style.RESET_ALL}")
             return
-        upcoming_events = filtered_events
+        upcoming_events = list(chain([first_event], filtered_events))
 
     # Sort events
+    total_events = len(upcoming_events)
     if sort_by_impact:
-        upcoming_events = sort_events_by_impact(upcoming_events)
+        upcoming_events = sort_events_by_impact(upcoming_events, limit)
     else:
-        upcoming_events = sort_events_by_datetime(upcoming_events)
+        upcoming_events = sort_events_by_datetime(upcoming_events, limit)
 
     # Display title with impact level if filtered
     title = f"Economic Events: {time_filter}"
-    if impact_level and impact_level.lower() != 'all':
-        title += f" ({impact_level.upper()} Impact Only)"
+    if impact_level:
+        title += f" ({impact_label} Impact Only)"
 
     print(f"\n{Fore.CYAN}=== {title} ==={Style.RESET_ALL}\n")
-    print(f"Total events: {len(upcoming_events)}\n")
+    if len(upcoming_events) < total_events:
+        print(f"Total events: {total_events} (showing first {len(upcoming_events)})\n")
+    else:
+        print(f"Total events: {total_events}\n")
 
     if summary:
         headers = ["Country", "Impact"]
@@ -108,10 +150,19 @@ async def display_events(news_filter, time_filter, summary=False, impact_level=N
     else:
         headers = ["Title", "Country", "Date", "Time", "Impact", "Forecast", "Previous"]
         table_data = []
+        # Events share days and release times, so format each distinct one once
+        date_strs = {}
+        time_strs = {}
         for event in upcoming_events:
             event_time = event['datetime']
-            date_str = event_time.strftime('%m-%d-%Y')
-            time_str = event_time.strftime('%I:%M%p')
+            date_key = (event_time.year, event_time.month, event_time.day)
+            date_str = date_strs.get(date_key)
+            if date_str is None:
+                date_str = date_strs[date_key] = event_time.strftime('%m-%d-%Y')
+            time_key = (event_time.hour, event_time.minute)
+            time_str = time_strs.get(time_key)
+            if time_str is None:
+                time_str = time_strs[time_key] = event_time.strftime('%I:%M%p')
 
             table_data.append([
                 event['event'][:50],
@@ -126,6 +177,17 @@ async def display_events(news_filter, time_filter, summary=False, impact_level=N
     print(tabulate(table_data, headers=headers, tablefmt="github"))
 
 
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {number}")
+    return number
+
+
 async def main():
     parser = argparse.ArgumentParser(description="Economic News Event Filter Tool")
     parser.add_argument('action', choices=['list'], help='Action to perform')
@@ -136,6 +198,7 @@ async def main():
     parser.add_argument('--sort-impact', action='store_true', help='Sort events by impact level')
     parser.add_argument('--impact', choices=['high', 'medium', 'low', 'all'],
                         help='Filter by impact level (high, medium, low, or all)')
+    parser.add_argument('--limit', type=positive_int, help='Show only the first N events after sorting')
     parser.add_argument('--debug', action='store_true', help='Show debug information')
 
     args = parser.parse_args()
@@ -160,28 +223,31 @@ async def main():
     if impact_level is None and args.sort_impact:
         impact_level = 'all'
 
+    # Fetch once; the debug summary below reuses the same events
+    all_events = news_filter.get_events_by_filter(time_filter)
+
     # Display events with the appropriate filters
     await display_events(
         news_filter=news_filter,
         time_filter=time_filter,
         summary=args.summary,
         impact_level=impact_level,
-        sort_by_impact=args.sort_impact
+        sort_by_impact=args.sort_impact,
+        events=all_events,
+        limit=args.limit
     )
 
     if args.debug:
-        # Show some debug information about the filter results
-        all_events = news_filter.get_events_by_filter(time_filter)
-        high_events = [e for e in all_events if e.get('impact', '').lower() == 'high']
-        medium_events = [e for e in all_events if e.get('impact', '').lower() == 'medium']
-        low_events = [e for e in all_events if e.get('impact', '').lower() == 'low']
+        # Show some debug information about the filter results, counted in one pass
+        impact_counts = Counter((e.get('impact') or '').lower() for e in all_events)
+        known_count = impact_counts['high'] + impact_counts['medium'] + impact_counts['low']
 
         print(f"\n{Fore.CYAN}=== Debug Information ==={Style.RESET_ALL}")
         print(f"Total events: {len(all_events)}")
-        print(f"High impact: {len(high_events)}")
-        print(f"Medium impact: {len(medium_events)}")
-        print(f"Low impact: {len(low_events)}")
-        print(f"Other/Unknown impact: {len(all_events) - len(high_events) - len(medium_events) - len(low_events)}")
+        print(f"High impact: {impact_counts['high']}")
+        print(f"Medium impact: {impact_counts['medium']}")
+        print(f"Low impact: {impact_counts['low']}")
+        print(f"Other/Unknown impact: {len(all_events) - known_count}")
 
 
 if __name__ == "__main__":
@@ -34,10 +34,17 @@ def show_variants(channel_id):
     print(f"Channel ID Variants for: {channel_id}")
     print(f"{'='*60}\n")
 
+    # Locate the input ID once instead of comparing it against every variant
+    try:
+        input_index = variants.index(channel_id)
+    except ValueError:
+        input_index = -1
+
+    lines = [f"  {i}. {variant:>17} " for i, variant in enumerate(variants, 1)]
+    if input_index >= 0:
+        lines[input_index] += "<- (input ID)"
     print("All possible ID formats that will match this channel:")
-    for i, variant in enumerate(variants, 1):
-        is_current = "<- (input ID)" if variant == channel_id else ""
-        print(f"  {i}. {variant:>17} {is_current}")
+    print("\n".join(lines))
 
     print("\n" + "="*60)
     print("Note: Any of these IDs can be used in your configuration")
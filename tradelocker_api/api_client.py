@@ -5,6 +5,7 @@ import logging
 import requests
 
 from tradelocker_api.endpoints.auth import TradeLockerAuth
+from utils.json_utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,8 @@ class ApiClient:
         self._circuit_states = {}  # Track circuit breaker states
         self._cache = {}  # Simple time-based cache
         self._cache_ttl = {}  # TTL for each cached item
-        self._last_request_time = {}
+        self._rate_buckets = {}  # Token bucket state per endpoint type
+        self._rate_limited_until = {}  # Server-requested pauses (Retry-After) per endpoint type
         self._endpoints_to_types = {
             "trade/accounts/": "GET_ACCOUNTS",
             "trade/positions": "GET_POSITIONS",
@@ -105,8 +107,12 @@ class ApiClient:
     async def ensure_session(self):
         """Ensure aiohttp session exists"""
         if self._session is None or self._session.closed:
+            # Keep connections to the API host alive so concurrent calls reuse them
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=75)
             self._session = aiohttp.ClientSession(
-                headers={"Content-Type": "application/json"}
+                connector=connector,
+                headers={"Content-Type": "application/json"},
+                json_serialize=json_dumps
             )
         return self._session
 
@@ -190,38 +196,61 @@ class ApiClient:
                 time.sleep(wait_time)
 
     # Asynchronous request method (for new code)
-    async def _enforce_rate_limit(self, endpoint):
-        """Enforce rate limits for API calls based on endpoint type"""
-        # Determine the endpoint type
-        endpoint_type = "DEFAULT"
+    def _get_endpoint_type(self, endpoint):
+        """Map an endpoint path to its rate limit type"""
         for key, type_name in self._endpoints_to_types.items():
             if key in endpoint:
-                endpoint_type = type_name
-                break
+                return type_name
+        return "DEFAULT"
+
+    async def _enforce_rate_limit(self, endpoint):
+        """
+        Enforce rate limits for API calls based on endpoint type.
+        Uses a token bucket per endpoint type, so bursts up to the configured request count
+        go through immediately and callers only wait once the bucket is empty.
+        """
+        endpoint_type = self._get_endpoint_type(endpoint)
 
         # Get rate limit config for this endpoint type
         rate_config = self._rate_limit_config.get(
             endpoint_type, self._rate_limit_config["DEFAULT"])
-        requests_allowed = rate_config["requests"]
-        time_window = rate_config["per_seconds"]
+        capacity = rate_config["requests"]
+        refill_rate = capacity / rate_config["per_seconds"]
 
-        # Calculate time since last request
-        now = time.time()
-        last_time = self._last_request_time.get(endpoint_type, 0)
-        time_passed = now - last_time
+        while True:
+            now = time.monotonic()
+
+            # Honour any pause the server asked for via Retry-After
+            limited_until = self._rate_limited_until.get(endpoint_type, 0)
+            if now < limited_until:
+                await asyncio.sleep(limited_until - now)
+                continue
+
+            # Refill the bucket for the time elapsed since it was last touched
+            bucket = self._rate_buckets.setdefault(endpoint_type, {'tokens': capacity, 'updated': now})
+            bucket['tokens'] = min(capacity, bucket['tokens'] + (now - bucket['updated']) * refill_rate)
+            bucket['updated'] = now
 
-        # If we've made a request recently, enforce the rate limit
-        if time_passed < time_window / requests_allowed:
-            # Calculate wait time needed
-            wait_time = (time_window / requests_allowed) - time_passed
-            wait_time = max(0.1, wait_time)  # At least 100ms delay
+            # Take a token without yielding in between, so concurrent callers can't share one
+            if bucket['tokens'] >= 1:
+                bucket['tokens'] -= 1
+                return
 
+            wait_time = (1 - bucket['tokens']) / refill_rate
             logger.debug(
                 f"Rate limit enforced for {endpoint_type}: waiting {wait_time:.2f}s")
             await asyncio.sleep(wait_time)
 
-        # Update last request time
-        self._last_request_time[endpoint_type] = time.time()
+    def _apply_retry_after(self, endpoint, retry_after):
+        """Pause an endpoint type for the duration given in a Retry-After header"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 1.0  # Header missing or an HTTP date - back off briefly
+
+        endpoint_type = self._get_endpoint_type(endpoint)
+        self._rate_limited_until[endpoint_type] = time.monotonic() + delay
+        logger.warning(f"Rate limited on {endpoint_type}, pausing for {delay:.1f}s")
 
     async def request_async(
             self,
@@ -235,7 +264,6 @@ class ApiClient:
             retry_count=3):
         """Make an asynchronous API request with caching, rate limiting and circuit breaker"""
         # Check circuit breaker
-        await self._enforce_rate_limit(endpoint)
         if not self._can_execute(endpoint):
             logger.warning(
                 f"Circuit breaker open for {endpoint}, request blocked")
@@ -250,6 +278,9 @@ class ApiClient:
                 if time.time() < self._cache_ttl.get(cache_key, 0):
                     return self._cache[cache_key]
 
+        # Only requests that actually go out count against the rate limit
+        await self._enforce_rate_limit(endpoint)
+
         # Prepare request
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         if headers is None:
@@ -275,11 +306,17 @@ class ApiClient:
                         headers["Authorization"] = f"Bearer {await self.auth.get_access_token_async()}"
                         continue  # Retry with new token
 
+                    # Handle 429 (Too Many Requests) - wait as long as the server asks, then retry
+                    if response.status == 429 and attempt < retry_count - 1:
+                        self._apply_retry_after(endpoint, response.headers.get('Retry-After'))
+                        await self._enforce_rate_limit(endpoint)
+                        continue
+
                     # Raise for other HTTP errors
                     response.raise_for_status()
 
                     # Parse response
-                    result = await response.json()
+                    result = await response.json(loads=json_loads)
 
                     # Cache the result if enabled
                     if cache_key is not None and cache_ttl > 0:
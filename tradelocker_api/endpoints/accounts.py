@@ -124,10 +124,13 @@ class TradeLockerAccounts(ApiClient):
     async def get_current_position_async(self, account_id: int, acc_num: int):
         """
         Retrieve the current open positions for the specified account - async version.
+        Cached briefly so bursts of lookups share one request; callers that modify
+        positions clear the entry via clear_cache_for_endpoint.
         """
         try:
             headers = {"accNum": str(acc_num)}
-            return await self.request_async('GET', f'trade/accounts/{account_id}/positions', headers=headers)
+            return await self.request_async('GET', f'trade/accounts/{account_id}/positions', headers=headers,
+                                            cache_ttl=2)
         except Exception as e:
             logger.error(f"Failed to fetch open positions: {e}")
             return None
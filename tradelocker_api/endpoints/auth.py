@@ -192,6 +192,12 @@ class TradeLockerAuth:
                 # If refresh fails, try full re-authentication
                 return await self.authenticate_async()
 
+    def invalidate_token(self, token):
+        """Mark a token the API rejected as expired so the next lookup renews it"""
+        # Only expire the current token; a rejected token may already have been replaced
+        if token == self.access_token:
+            self.token_expiry = 0
+
     async def get_access_token_async(self):
         """Get a valid access token, authenticating if necessary - async method"""
         if not self.access_token or time.time() > self.token_expiry - 300:
@@ -1,20 +1,63 @@
+import asyncio
 import logging
+from collections import OrderedDict
 from functools import lru_cache
 from tradelocker_api.endpoints.auth import TradeLockerAuth
 from tradelocker_api.api_client import ApiClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of instrument lookups kept in memory
+INSTRUMENT_CACHE_SIZE = 512
+
 
 class TradeLockerInstruments(ApiClient):
     """
     Client for TradeLocker instruments API with improved caching and async support
     """
 
+    # Instrument caches are shared by every client instance (the quotes client keeps its own
+    # instruments client), so a lookup made through one is a hit for all of them
+    _instrument_cache = OrderedDict()
+    # Name and ID indexes over the latest instruments list per account
+    _instrument_index = {}
+    # In-flight instrument list fetches per account, so concurrent misses share one request
+    _inflight_fetches = {}
+
     def __init__(self, auth: TradeLockerAuth):
         super().__init__(auth)
-        # In-memory cache for instrument lookups
-        self._instrument_cache = {}
+
+    def _get_cached_instrument(self, cache_key):
+        """Return a cached instrument lookup and mark it as recently used"""
+        instrument = self._instrument_cache.get(cache_key)
+        if instrument is not None:
+            self._instrument_cache.move_to_end(cache_key)
+        return instrument
+
+    def _cache_instrument(self, cache_key, instrument):
+        """Cache an instrument lookup, evicting the least recently used entries past the size limit"""
+        self._instrument_cache[cache_key] = instrument
+        self._instrument_cache.move_to_end(cache_key)
+        while len(self._instrument_cache) > INSTRUMENT_CACHE_SIZE:
+            self._instrument_cache.popitem(last=False)
+
+    def _index_instruments(self, account_id, acc_num, instruments):
+        """
+        Index an instruments list by name and by ID.
+        The index is rebuilt only when a different instruments list is fetched.
+        """
+        key = (account_id, acc_num)
+        index = self._instrument_index.get(key)
+        if index is None or index['source'] is not instruments:
+            by_name = {}
+            by_id = {}
+            for instrument in instruments:
+                # Keep the first occurrence, matching the previous linear scan
+                by_name.setdefault(instrument.get('name'), instrument)
+                by_id.setdefault(int(instrument.get('tradableInstrumentId', -1)), instrument)
+            index = {'source': instruments, 'name': by_name, 'id': by_id}
+            self._instrument_index[key] = index
+        return index
 
     # Synchronous methods (for backward compatibility)
 
@@ -55,17 +98,18 @@ class TradeLockerInstruments(ApiClient):
         cache_key = f"{account_id}:{acc_num}:{name}"
 
         # Check in-memory cache first
-        if cache_key in self._instrument_cache:
-            return self._instrument_cache[cache_key]
+        cached = self._get_cached_instrument(cache_key)
+        if cached is not None:
+            return cached
 
         # Fetch instruments if needed
         instruments = self.get_instruments(account_id, acc_num)
         if instruments:
-            for instrument in instruments:
-                if instrument.get('name') == name:
-                    # Cache the result
-                    self._instrument_cache[cache_key] = instrument
-                    return instrument
+            instrument = self._index_instruments(account_id, acc_num, instruments)['name'].get(name)
+            if instrument:
+                # Cache the result
+                self._cache_instrument(cache_key, instrument)
+                return instrument
             logger.warning(f"Instrument '{name}' not found.")
         return None
 
@@ -77,8 +121,9 @@ class TradeLockerInstruments(ApiClient):
         cache_key = f"{account_id}:{acc_num}:id:{instrument_id}"
 
         # Check in-memory cache first
-        if cache_key in self._instrument_cache:
-            return self._instrument_cache[cache_key]
+        cached = self._get_cached_instrument(cache_key)
+        if cached is not None:
+            return cached
 
         # Fetch instruments if needed
         instruments = self.get_instruments(account_id, acc_num)
@@ -88,12 +133,11 @@ class TradeLockerInstruments(ApiClient):
             return None
 
         # Find instrument by ID
-        for instrument in instruments:
-            current_instrument_id = int(instrument.get('tradableInstrumentId', -1))
-            if current_instrument_id == int(instrument_id):
-                # Cache the result
-                self._instrument_cache[cache_key] = instrument
-                return instrument
+        instrument = self._index_instruments(account_id, acc_num, instruments)['id'].get(int(instrument_id))
+        if instrument:
+            # Cache the result
+            self._cache_instrument(cache_key, instrument)
+            return instrument
 
         logger.warning(f"Instrument with ID {instrument_id} not found.")
         return None
@@ -103,7 +147,18 @@ class TradeLockerInstruments(ApiClient):
     async def get_instruments_async(self, account_id: int, acc_num: int):
         """
         Fetch all available instruments for the account - async version.
+        Concurrent callers for the same account wait on a single in-flight request.
         """
+        key = (account_id, acc_num)
+        task = self._inflight_fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_instruments_async(account_id, acc_num))
+            self._inflight_fetches[key] = task
+            task.add_done_callback(lambda _: self._inflight_fetches.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_instruments_async(self, account_id: int, acc_num: int):
+        """Request the instruments list for the account"""
         try:
             headers = {"accNum": str(acc_num)}
             # Cache instruments for 30 minutes (1800 seconds)
@@ -134,17 +189,18 @@ class TradeLockerInstruments(ApiClient):
         cache_key = f"{account_id}:{acc_num}:{name}"
 
         # Check in-memory cache first
-        if cache_key in self._instrument_cache:
-            return self._instrument_cache[cache_key]
+        cached = self._get_cached_instrument(cache_key)
+        if cached is not None:
+            return cached
 
         # Fetch instruments if needed
         instruments = await self.get_instruments_async(account_id, acc_num)
         if instruments:
-            for instrument in instruments:
-                if instrument.get('name') == name:
-                    # Cache the result
-                    self._instrument_cache[cache_key] = instrument
-                    return instrument
+            instrument = self._index_instruments(account_id, acc_num, instruments)['name'].get(name)
+            if instrument:
+                # Cache the result
+                self._cache_instrument(cache_key, instrument)
+                return instrument
             logger.warning(f"Instrument '{name}' not found.")
         return None
 
@@ -155,8 +211,9 @@ class TradeLockerInstruments(ApiClient):
         cache_key = f"{account_id}:{acc_num}:id:{instrument_id}"
 
         # Check in-memory cache first
-        if cache_key in self._instrument_cache:
-            return self._instrument_cache[cache_key]
+        cached = self._get_cached_instrument(cache_key)
+        if cached is not None:
+            return cached
 
         # Fetch instruments if needed
         instruments = await self.get_instruments_async(account_id, acc_num)
@@ -166,12 +223,11 @@ class TradeLockerInstruments(ApiClient):
             return None
 
         # Find instrument by ID
-        for instrument in instruments:
-            current_instrument_id = int(instrument.get('tradableInstrumentId', -1))
-            if current_instrument_id == int(instrument_id):
-                # Cache the result
-                self._instrument_cache[cache_key] = instrument
-                return instrument
+        instrument = self._index_instruments(account_id, acc_num, instruments)['id'].get(int(instrument_id))
+        if instrument:
+            # Cache the result
+            self._cache_instrument(cache_key, instrument)
+            return instrument
 
         logger.warning(f"Instrument with ID {instrument_id} not found.")
         return None
@@ -179,6 +235,7 @@ class TradeLockerInstruments(ApiClient):
     def clear_cache(self):
         """Clear all instrument caches"""
         self._instrument_cache.clear()
+        self._instrument_index.clear()
         # Clear lru_cache for get_instrument_by_name
         self.get_instrument_by_name.cache_clear()
         # Also clear the parent class cache
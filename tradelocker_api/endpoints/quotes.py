@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from tradelocker_api.endpoints.auth import TradeLockerAuth
 from tradelocker_api.api_client import ApiClient
@@ -17,6 +18,8 @@ class TradeLockerQuotes(ApiClient):
         self.instrument_client = TradeLockerInstruments(auth)
         # Cache to store route IDs by instrument
         self._route_cache = {}
+        # In-flight quote requests, so concurrent callers for the same quote share one request
+        self._inflight_quotes = {}
 
     # Synchronous methods (for backward compatibility)
 
@@ -79,10 +82,11 @@ class TradeLockerQuotes(ApiClient):
 
     # Asynchronous methods (for new code)
 
-    async def get_quote_async(self, account: dict, instrument_name: str):
+    async def get_quote_async(self, account: dict, instrument_name: str, instrument_data: dict = None):
         """
         Fetch the current price (quote) of the instrument - async version.
         Enhanced to handle different instrument naming conventions.
+        Callers that already hold the instrument data can pass it to skip the lookup by name.
         """
         try:
             acc_num = account['accNum']
@@ -93,12 +97,13 @@ class TradeLockerQuotes(ApiClient):
             route_info = self._route_cache.get(route_key)
 
             if not route_info:
-                # Get instrument details by name
-                instrument_data = await self.instrument_client.get_instrument_by_name_async(
-                    account_id=account_id,
-                    acc_num=acc_num,
-                    name=instrument_name
-                )
+                # Get instrument details by name unless the caller supplied them
+                if not instrument_data:
+                    instrument_data = await self.instrument_client.get_instrument_by_name_async(
+                        account_id=account_id,
+                        acc_num=acc_num,
+                        name=instrument_name
+                    )
 
                 if not instrument_data:
                     logger.warning(f"Instrument {instrument_name} not found.")
@@ -112,18 +117,20 @@ class TradeLockerQuotes(ApiClient):
                     if group_name and alternate_names:
                         logger.info(f"Trying alternate names for {instrument_name}: {alternate_names}")
 
-                        # Try each alternate name
-                        for alt_name in alternate_names:
-                            if alt_name == instrument_name:
-                                continue  # Skip the original name
-
-                            alt_instrument = await self.instrument_client.get_instrument_by_name_async(
+                        # Look up every alternate name at once (skipping the original name),
+                        # then take the first hit in priority order
+                        alt_names = [alt_name for alt_name in alternate_names if alt_name != instrument_name]
+                        alt_instruments = await asyncio.gather(
+                            *(self.instrument_client.get_instrument_by_name_async(
                                 account_id=account_id,
                                 acc_num=acc_num,
                                 name=alt_name
-                            )
+                            ) for alt_name in alt_names),
+                            return_exceptions=True
+                        )
 
-                            if alt_instrument:
+                        for alt_name, alt_instrument in zip(alt_names, alt_instruments):
+                            if alt_instrument and not isinstance(alt_instrument, Exception):
                                 logger.info(f"Found instrument using alternate name: {alt_name}")
                                 instrument_data = alt_instrument
                                 break
@@ -157,8 +164,16 @@ class TradeLockerQuotes(ApiClient):
                 "tradableInstrumentId": tradable_instrument_id
             }
 
-            # Quotes are never cached as they change frequently
-            return await self.request_async('GET', 'trade/quotes', headers=headers, params=params)
+            # Quotes are never cached as they change frequently, but concurrent requests
+            # for the same quote (e.g. several positions on one instrument) share one call
+            quote_key = (acc_num, info_route, tradable_instrument_id)
+            task = self._inflight_quotes.get(quote_key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    self.request_async('GET', 'trade/quotes', headers=headers, params=params))
+                self._inflight_quotes[quote_key] = task
+                task.add_done_callback(lambda _: self._inflight_quotes.pop(quote_key, None))
+            return await asyncio.shield(task)
 
         except Exception as e:
             logger.error(f"Error while fetching quote: {e}")
@@ -169,8 +184,6 @@ class TradeLockerQuotes(ApiClient):
         Fetch quotes for multiple instruments in parallel - async version.
         Enhanced to handle different instrument naming conventions.
         """
-        import asyncio
-
         try:
             tasks = []
             for name in instrument_names:
@@ -1,5 +1,6 @@
 import re
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -58,9 +59,11 @@ for group_name, nicknames in INSTRUMENT_GROUPS.items():
 PLATFORM_SUFFIXES = ['.C', '.Z', '.X', '+', '-', '', '_']
 
 
+@lru_cache(maxsize=1024)
 def normalize_instrument_name(name):
     """
     Normalize an instrument name to its canonical form.
+    Results are memoized since the set of names seen is small and the lookup is pure.
 
     Args:
         name: Instrument name to normalize
@@ -278,19 +281,16 @@ def find_instrument_in_platform(canonical_name, available_instruments):
         # If we can't identify a group, just use the canonical name
         target_nicknames = [canonical_name]
 
-    # Score and sort all available instruments
-    scored_instruments = []
+    # Keep only the best (score, name) seen - same ordering the full sort used, in one pass
+    best_match = None
     for instrument in available_instruments:
         instr_name = instrument.get('name', '')
         score = score_instrument_match(instr_name, target_nicknames)
-        if score > 0:
-            scored_instruments.append((score, instr_name))
-
-    # Sort by score descending
-    scored_instruments.sort(reverse=True)
+        if score > 0 and (best_match is None or (score, instr_name) > best_match):
+            best_match = (score, instr_name)
 
     # Return the best match, or None if no matches
-    return scored_instruments[0][1] if scored_instruments else None
+    return best_match[1] if best_match else None
 
 
 def match_instrument_by_context(text, open_positions):
@@ -0,0 +1,25 @@
+import json
+
+# orjson is optional - fall back to the standard library when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(value, pretty=False):
+    """
+    Serialize a value to a JSON string.
+    Returns str rather than bytes so it can be used as aiohttp's json_serialize.
+    Pass pretty=True for two-space indented output.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else None).decode()
+    return json.dumps(value, indent=2 if pretty else None)
+
+
+def json_loads(data):
+    """Parse a JSON document from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)